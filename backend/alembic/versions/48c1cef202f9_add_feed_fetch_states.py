@@ -0,0 +1,35 @@
+"""add_feed_fetch_states
+
+Revision ID: 48c1cef202f9
+Revises: 94422d01d65b
+Create Date: 2026-10-18 04:06:09.215554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '48c1cef202f9'
+down_revision: Union[str, None] = '94422d01d65b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('feed_fetch_states',
+    sa.Column('feed_id', sa.String(), nullable=False),
+    sa.Column('etag', sa.String(), nullable=True),
+    sa.Column('last_modified', sa.String(), nullable=True),
+    sa.Column('body_hash', sa.String(length=64), nullable=True),
+    sa.Column('last_status', sa.Integer(), nullable=True),
+    sa.Column('last_checked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_changed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('feed_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('feed_fetch_states') 
\ No newline at end of file
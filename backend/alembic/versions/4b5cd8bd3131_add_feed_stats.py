@@ -0,0 +1,56 @@
+"""add_feed_stats
+
+Revision ID: 4b5cd8bd3131
+Revises: 9312e91a414e
+Create Date: 2026-10-18 04:42:00.501583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b5cd8bd3131'
+down_revision: Union[str, None] = '9312e91a414e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Counts every stored article along each dimension in one scan; missing values are stored as ''
+BACKFILL_SQL = """
+INSERT INTO feed_stats (dimension, value, articles)
+SELECT
+    CASE
+        WHEN GROUPING(language) = 0 THEN 'language'
+        WHEN GROUPING(region) = 0 THEN 'region'
+        WHEN GROUPING(state) = 0 THEN 'state'
+        ELSE 'total'
+    END,
+    coalesce(
+        CASE
+            WHEN GROUPING(language) = 0 THEN language
+            WHEN GROUPING(region) = 0 THEN region
+            WHEN GROUPING(state) = 0 THEN state
+        END,
+        ''
+    ),
+    count(*)
+FROM feeds
+GROUP BY GROUPING SETS ((), (language), (region), (state))
+"""
+
+
+def upgrade() -> None:
+    op.create_table('feed_stats',
+    sa.Column('dimension', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('articles', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'value')
+    )
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    op.drop_table('feed_stats') 
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""add_feed_near_duplicates
+
+Revision ID: 7533e38b61ac
+Revises: 971500ad0fca
+Create Date: 2026-10-18 04:24:48.682202
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7533e38b61ac'
+down_revision: Union[str, None] = '971500ad0fca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feeds', sa.Column('simhash', sa.BigInteger(), nullable=True))
+    op.add_column('feeds', sa.Column('cluster_id', sa.BigInteger(), nullable=True))
+    op.add_column('feeds', sa.Column('is_duplicate', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_index(op.f('ix_feeds_cluster_id'), 'feeds', ['cluster_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_feeds_cluster_id'), table_name='feeds')
+    op.drop_column('feeds', 'is_duplicate')
+    op.drop_column('feeds', 'cluster_id')
+    op.drop_column('feeds', 'simhash') 
\ No newline at end of file
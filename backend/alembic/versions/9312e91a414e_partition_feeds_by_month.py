@@ -0,0 +1,139 @@
+"""partition_feeds_by_month
+
+Revision ID: 9312e91a414e
+Revises: a5e2fcf6d4a3
+Create Date: 2026-10-18 04:38:01.864852
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9312e91a414e'
+down_revision: Union[str, None] = 'a5e2fcf6d4a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Every stored column of feeds; search_vector is generated and recomputed on insert
+COLUMNS = (
+    'id', 'title', 'description', 'link', 'published_date', 'source', 'language', 'region', 'state',
+    'content', 'content_html', 'author', 'image_urls', 'keywords', 'topics', 'topics_version',
+    'simhash', 'cluster_id', 'is_duplicate', 'summary', 'extracted_by', 'extraction_time',
+    'extraction_success', 'created_at', 'updated_at'
+)
+COLUMN_LIST = ', '.join(COLUMNS)
+
+# Index name -> columns, recreated on the partitioned table
+INDEXES = {
+    'ix_feeds_id': ['id'],
+    'ix_feeds_title': ['title'],
+    'ix_feeds_link': ['link'],
+    'ix_feeds_source': ['source'],
+    'ix_feeds_language': ['language'],
+    'ix_feeds_region': ['region'],
+    'ix_feeds_state': ['state'],
+    'ix_feeds_topics_version': ['topics_version'],
+    'ix_feeds_cluster_id': ['cluster_id'],
+    'ix_feeds_published_date_id': ['published_date', 'id'],
+    'ix_feeds_language_published_date_id': ['language', 'published_date', 'id'],
+    'ix_feeds_region_published_date_id': ['region', 'published_date', 'id'],
+    'ix_feeds_state_published_date_id': ['state', 'published_date', 'id'],
+}
+
+# One partition per month from the oldest article (at most this far back) to two months ahead;
+# anything outside that range lands in feeds_default
+CREATE_PARTITIONS_SQL = """
+DO $$
+DECLARE
+    month date;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            greatest(
+                date_trunc('month', coalesce(min(published_date), now())),
+                date_trunc('month', now()) - interval '5 years'
+            ),
+            date_trunc('month', now()) + interval '2 months',
+            interval '1 month'
+        )::date
+        FROM feeds_legacy
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF feeds FOR VALUES FROM (%L) TO (%L)',
+            'feeds_p' || to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date
+        );
+    END LOOP;
+END $$
+"""
+
+
+def upgrade() -> None:
+    # Foreign keys cannot reference a partitioned table
+    op.execute('ALTER TABLE articles DROP CONSTRAINT IF EXISTS articles_feed_id_fkey')
+    op.create_index(op.f('ix_articles_feed_id'), 'articles', ['feed_id'], unique=False)
+
+    op.execute('ALTER TABLE feeds RENAME TO feeds_legacy')
+    op.execute(
+        'CREATE TABLE feeds (LIKE feeds_legacy INCLUDING DEFAULTS INCLUDING GENERATED) '
+        'PARTITION BY RANGE (published_date)'
+    )
+    op.execute('ALTER TABLE feeds ALTER COLUMN published_date SET NOT NULL')
+    op.execute(CREATE_PARTITIONS_SQL)
+    op.execute('CREATE TABLE feeds_default PARTITION OF feeds DEFAULT')
+
+    # Undated articles are filed under the time they were first stored
+    select_list = COLUMN_LIST.replace(
+        'published_date', "coalesce(published_date, created_at AT TIME ZONE 'UTC', now() AT TIME ZONE 'UTC')"
+    )
+    op.execute(f'INSERT INTO feeds ({COLUMN_LIST}) SELECT {select_list} FROM feeds_legacy')
+    op.execute('ALTER SEQUENCE feeds_id_seq OWNED BY feeds.id')
+    op.drop_table('feeds_legacy')
+
+    op.create_primary_key('feeds_pkey', 'feeds', ['id', 'published_date'])
+    op.create_unique_constraint('uq_feeds_link_published_date', 'feeds', ['link', 'published_date'])
+    # Indexes on the parent are created on every partition, including later ones
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'feeds', columns, unique=False)
+    op.create_index('ix_feeds_search_vector', 'feeds', ['search_vector'], unique=False, postgresql_using='gin')
+
+    op.create_table('feed_partition_archives',
+    sa.Column('partition_name', sa.String(), nullable=False),
+    sa.Column('path', sa.String(), nullable=False),
+    sa.Column('rows', sa.Integer(), nullable=False),
+    sa.Column('bytes', sa.BigInteger(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('removed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('partition_name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('feed_partition_archives')
+
+    # Rows of detached or dropped partitions are not restored; when a link was stored under
+    # several dates only its latest row is kept so the old unique link index can be rebuilt
+    op.execute('ALTER TABLE feeds RENAME TO feeds_partitioned')
+    op.execute(
+        'CREATE TABLE feeds (LIKE feeds_partitioned INCLUDING DEFAULTS INCLUDING GENERATED)'
+    )
+    op.execute('ALTER TABLE feeds ALTER COLUMN published_date DROP NOT NULL')
+    op.execute(
+        f'INSERT INTO feeds ({COLUMN_LIST}) '
+        f'SELECT DISTINCT ON (link) {COLUMN_LIST} FROM feeds_partitioned '
+        'ORDER BY link, published_date DESC, id DESC'
+    )
+    op.execute('ALTER SEQUENCE feeds_id_seq OWNED BY feeds.id')
+    op.execute('DROP TABLE feeds_partitioned CASCADE')
+
+    op.create_primary_key('feeds_pkey', 'feeds', ['id'])
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'feeds', columns, unique=name == 'ix_feeds_link')
+    op.create_index('ix_feeds_search_vector', 'feeds', ['search_vector'], unique=False, postgresql_using='gin')
+
+    op.execute('UPDATE articles SET feed_id = NULL WHERE feed_id NOT IN (SELECT id FROM feeds)')
+    op.drop_index(op.f('ix_articles_feed_id'), table_name='articles')
+    op.create_foreign_key('articles_feed_id_fkey', 'articles', 'feeds', ['feed_id'], ['id'])
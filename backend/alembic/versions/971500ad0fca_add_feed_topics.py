@@ -0,0 +1,30 @@
+"""add_feed_topics
+
+Revision ID: 971500ad0fca
+Revises: 48c1cef202f9
+Create Date: 2026-10-18 04:20:16.814276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '971500ad0fca'
+down_revision: Union[str, None] = '48c1cef202f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feeds', sa.Column('topics', sa.JSON(), nullable=True))
+    op.add_column('feeds', sa.Column('topics_version', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_feeds_topics_version'), 'feeds', ['topics_version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_feeds_topics_version'), table_name='feeds')
+    op.drop_column('feeds', 'topics_version')
+    op.drop_column('feeds', 'topics') 
\ No newline at end of file
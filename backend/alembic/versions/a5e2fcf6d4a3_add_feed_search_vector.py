@@ -0,0 +1,47 @@
+"""add_feed_search_vector
+
+Revision ID: a5e2fcf6d4a3
+Revises: e5d9d0abe506
+Create Date: 2026-10-18 04:35:23.185286
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5e2fcf6d4a3'
+down_revision: Union[str, None] = 'e5d9d0abe506'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# English articles are stemmed, other languages are indexed word for word
+SEARCH_CONFIG = "CASE language WHEN 'en' THEN 'english'::regconfig ELSE 'simple'::regconfig END"
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector({SEARCH_CONFIG}, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector({SEARCH_CONFIG}, coalesce(summary, '')), 'B') || "
+    f"setweight(to_tsvector({SEARCH_CONFIG}, left(coalesce(content, ''), 100000)), 'C')"
+)
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites the table once
+    op.add_column(
+        'feeds',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True)
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_feeds_search_vector', 'feeds', ['search_vector'], unique=False,
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_feeds_search_vector', table_name='feeds', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('feeds', 'search_vector')
@@ -0,0 +1,43 @@
+"""add_feed_pagination_indexes
+
+Revision ID: e5d9d0abe506
+Revises: 7533e38b61ac
+Create Date: 2026-10-18 04:32:50.401863
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5d9d0abe506'
+down_revision: Union[str, None] = '7533e38b61ac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Index name -> leading columns; every index ends with (published_date, id) for keyset pagination
+INDEXES = {
+    'ix_feeds_published_date_id': [],
+    'ix_feeds_language_published_date_id': ['language'],
+    'ix_feeds_region_published_date_id': ['region'],
+    'ix_feeds_state_published_date_id': ['state'],
+}
+
+
+def upgrade() -> None:
+    # Built concurrently, outside the migration transaction, so ingestion keeps writing meanwhile
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name, 'feeds', [*columns, 'published_date', 'id'], unique=False,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name='feeds', postgresql_concurrently=True, if_exists=True)
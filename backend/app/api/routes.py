@@ -1,13 +1,21 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 from ..graph_db import Neo4jManager
+from .. import crud
 from ..database import get_db
 from sqlalchemy.orm import Session
 
 router = APIRouter()
 neo4j = Neo4jManager()
 
+# Columns the Neo4j sync reads, loaded in addition to the fields a client asks for;
+# article bodies stay unloaded, the graph relies on the stored summary and topics
+GRAPH_SYNC_FIELDS = (
+    'title', 'description', 'link', 'published_date', 'source', 'language', 'state',
+    'author', 'keywords', 'topics', 'is_duplicate', 'summary'
+)
+
 class FeedCreate(BaseModel):
     name: str
     url: str
@@ -89,31 +97,41 @@ async def get_trending_topics(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/feeds/search")
-async def search_feeds(
+def search_feeds(
+    response: Response,
     query: str,
     source: Optional[str] = None,
     state: Optional[str] = None,
     language: Optional[str] = None,
-    date_from: Optional[str] = None,
-    date_to: Optional[str] = None
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
 ) -> List[Dict]:
-    """Search feeds with advanced filtering"""
+    """Full-text search over title, summary and content, best match first, with highlighted snippets
+
+    The next page is fetched by passing the X-Next-Cursor response header back as cursor.
+    """
     try:
-        filters = {}
-        if source:
-            filters['source'] = source
-        if state:
-            filters['state'] = state
-        if language:
-            filters['language'] = language
-        if date_from:
-            filters['date_from'] = date_from
-        if date_to:
-            filters['date_to'] = date_to
-            
-        return neo4j.search_feeds(query, filters)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        results, next_cursor = crud.search_feeds(
+            db,
+            query,
+            limit=limit,
+            cursor=cursor,
+            fields=crud.parse_fields(fields),
+            source=source,
+            state=state,
+            language=language,
+            date_from=date_from,
+            date_to=date_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return results
 
 @router.get("/feeds/stats")
 async def get_feed_stats() -> Dict:
@@ -126,52 +144,53 @@ async def get_feed_stats() -> Dict:
 # Update the existing feed endpoints to also store in Neo4j
 @router.get("/feeds/")
 def get_feeds(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
     language: Optional[str] = None,
     region: Optional[str] = None,
     state: Optional[str] = None,
+    cluster_id: Optional[int] = None,
+    collapse_duplicates: bool = False,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get RSS feeds with optional filtering"""
-    from ..models import Feed  # Import here to avoid circular imports
-    
-    query = db.query(Feed)
-    
-    if language:
-        query = query.filter(Feed.language == language)
-    if region:
-        query = query.filter(Feed.region == region)
-    if state:
-        query = query.filter(Feed.state == state)
-        
-    feeds = query.offset(skip).limit(limit).all()
+    """Get RSS feeds, newest first, with optional filtering; collapse_duplicates keeps one article per near-duplicate cluster
+
+    The next page is fetched by passing the X-Next-Cursor response header back as cursor. fields is a
+    comma-separated list of columns to return instead of the summary columns; content comes from /feeds/{feed_id}.
+    """
+    try:
+        field_names = crud.parse_fields(fields)
+        feeds, next_cursor = crud.get_feeds(
+            db,
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            language=language,
+            region=region,
+            state=state,
+            cluster_id=cluster_id,
+            collapse_duplicates=collapse_duplicates,
+            fields=(*field_names, *GRAPH_SYNC_FIELDS)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
     
-    # Convert feeds to dictionaries and handle JSON fields
     feed_list = []
     for feed in feeds:
-        feed_dict = {
-            "id": feed.id,
-            "title": feed.title,
-            "description": feed.description,
-            "link": feed.link,
-            "published_date": feed.published_date,
-            "source": feed.source,
-            "language": feed.language,
-            "region": feed.region,
-            "state": feed.state,
-            "content": feed.content,
-            "author": feed.author,
-            "image_urls": feed.image_urls or [],
-            "keywords": feed.keywords or [],
-            "summary": feed.summary,
-            "extraction_success": feed.extraction_success
-        }
-        feed_list.append(feed_dict)
+        feed_list.append(crud.serialize_feed(feed, field_names))
         
+        # Near-duplicates of a stored story would be counted twice in the graph
+        if feed.is_duplicate:
+            continue
+
         # Store in Neo4j asynchronously
         try:
-            neo4j.create_or_update_feed(feed_dict)
+            neo4j.create_or_update_feed(crud.serialize_feed(feed, GRAPH_SYNC_FIELDS))
         except Exception as e:
             logger.warning(f"Failed to store feed in Neo4j: {str(e)}")
     
@@ -7,7 +7,74 @@ from pathlib import Path
 class Settings(BaseSettings):
     DATABASE_URL: PostgresDsn
     FEED_CONFIG_PATH: str = "feeds_config.json"
-    FETCH_INTERVAL: int = 30  # minutes
+    FETCH_INTERVAL: int = 30  # minutes, initial polling interval of each feed
+
+    # Adaptive polling settings
+    POLL_MIN_INTERVAL: float = 5  # minutes
+    POLL_MAX_INTERVAL: float = 180  # minutes
+    POLL_TARGET_NEW_ITEMS: float = 3  # new items expected between two polls of a feed
+    POLL_RATE_SMOOTHING: float = 0.3  # weight of the latest poll in the publication rate average
+    POLL_BATCH_WINDOW: float = 30  # seconds, feeds due this close together are polled in one cycle
+
+    # Shared HTTP client settings
+    HTTP_MAX_CONNECTIONS: int = 32
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 4  # simultaneous article downloads from one host across all extraction workers
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0  # seconds
+    HTTP_TIMEOUT: float = 10.0  # seconds
+    HTTP_HTTP2: bool = True  # used when the h2 package is installed
+    HTTP_MAX_PAGE_BYTES: int = 5 * 1024 ** 2  # article downloads larger than this are abandoned
+
+    # Feed download settings
+    ASYNC_FETCH: bool = True
+    FETCH_CONCURRENCY: int = 16
+    FETCH_PER_HOST_CONCURRENCY: int = 2
+    FETCH_TIMEOUT: float = 20.0  # seconds
+    SEEN_LINKS_CACHE_SIZE: int = 100000  # most recent links kept in memory for deduplication
+
+    # Article write settings
+    WRITE_BATCH_SIZE: int = 100
+    WRITE_ON_CONFLICT: str = "nothing"  # "nothing" keeps existing rows, "update" refreshes them
+
+    # Article extraction settings
+    EXTRACTION_WORKERS: int = 0  # 0 uses one worker per CPU core
+    EXTRACTOR_STATS_FILE: str = "extractor_stats.json"  # per-domain strategy statistics; empty keeps them in memory
+    EXTRACTOR_MIN_ATTEMPTS: int = 10  # attempts before a strategy can be skipped for a domain
+    EXTRACTOR_MIN_SUCCESS_RATE: float = 0.2  # strategies below this success rate are skipped for the domain
+    EXTRACTOR_EXPLORE_INTERVAL: int = 20  # every Nth article of a domain still tries skipped strategies
+    EXTRACTION_MEMO_SIZE: int = 5000  # extraction results kept by canonical URL so a story shared by feeds is extracted once; 0 disables
+
+    # Language detection settings
+    LANGUAGE_SAMPLE_CHARS: int = 2000  # characters inspected by the script histogram and langdetect
+    LANGUAGE_SCRIPT_THRESHOLD: float = 0.6  # share of letters a script needs to count as dominant
+
+    # Keyword extraction settings
+    KEYWORDS_PER_ARTICLE: int = 10
+    KEYWORD_STATS_FILE: str = "keyword_stats.json"  # document frequencies per language; empty keeps them in memory
+    KEYWORD_MAX_TERMS: int = 200000  # vocabulary size per language before rare terms are pruned
+
+    # Topic extraction settings
+    TOPIC_BATCH_SIZE: int = 25  # articles per named entity job sent to the extraction pool
+
+    # Near-duplicate detection settings
+    NEARDUP_INDEX_SIZE: int = 200000  # most recent article fingerprints kept in the LSH index
+    NEARDUP_MAX_DISTANCE: int = 4  # Hamming distance between SimHashes still counted as the same story
+
+    # Raw HTML cache settings
+    HTML_CACHE_DIR: str = "html_cache"  # empty disables the cache
+    HTML_CACHE_MAX_BYTES: int = 2 * 1024 ** 3
+
+    # Partitioning and retention settings
+    PARTITION_MONTHS_AHEAD: int = 2  # monthly partitions of feeds created ahead of the current month
+    RETENTION_ARCHIVE_AFTER_DAYS: int = 365  # article text of months older than this moves to archive files; 0 disables
+    RETENTION_REMOVE_AFTER_DAYS: int = 0  # archived months older than this leave the feeds table; 0 keeps them
+    RETENTION_REMOVE_MODE: str = "detach"  # "detach" keeps the partition as a standalone table, "drop" deletes it
+    ARCHIVE_DIR: str = "archive"
+
+    # Retry and circuit breaker settings
+    RETRY_MAX_ATTEMPTS: int = 3
+    RETRY_BASE_DELAY: float = 2.0  # seconds, doubled after each failed attempt
+    BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive failures before a domain is paused
+    BREAKER_COOLDOWN: float = 300.0  # seconds a failing domain is paused
     
     # Neo4j settings
     NEO4J_URI: str = "bolt://localhost:7687"
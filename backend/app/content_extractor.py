@@ -1,37 +1,47 @@
+import codecs
 import trafilatura
 from newspaper import Article, Config
 import logging
-from typing import Optional, Dict, List
-import requests
+from typing import Optional, Dict, List, Tuple
+import httpx
 from datetime import datetime
 import json
 import time
 from urllib.parse import urlparse, urlparse
 import re
-from bs4 import BeautifulSoup
 import dateparser
-import tldextract
+from . import http_client
+from .domain_registry import get_domain_registry
+from .html_cache import get_html_cache
+from .extractor_stats import DEFAULT_STRATEGIES
+from .language import LanguageDetector
+from .urls import canonicalize_url, find_canonical_url
+import lxml.html
+from lxml.html import HtmlElement
 
 logger = logging.getLogger(__name__)
 
+# Byte order marks take precedence over any declared charset
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="text/html; charset=...">, searched in the page head
+META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+CHARSET_SNIFF_BYTES = 4096
+
 class ContentExtractor:
     def __init__(self):
         # Configure newspaper
         self.newspaper_config = Config()
-        self.newspaper_config.browser_user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        self.newspaper_config.browser_user_agent = http_client.USER_AGENT
         self.newspaper_config.request_timeout = 10
         self.newspaper_config.fetch_images = True
         self.newspaper_config.keep_article_html = True
         self.newspaper_config.memoize_articles = False
 
-        # Configure requests
-        self.headers = {
-            'User-Agent': self.newspaper_config.browser_user_agent,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-        }
-        
         # Configure trafilatura
         self.trafilatura_config = {
             'include_comments': False,
@@ -43,37 +53,15 @@ class ContentExtractor:
             'include_formatting': True
         }
 
-        # State mapping for Indian news sources
-        self.state_mapping = {
-            'thehindu.com': 'All',
-            'timesofindia.indiatimes.com': 'All',
-            'jagran.com': 'All',
-            'dinamalar.com': 'Tamil Nadu',
-            'dinakaran.com': 'Tamil Nadu',
-            'amarujala.com': 'Uttar Pradesh',
-            'bhaskar.com': 'Madhya Pradesh',
-            'lokmat.com': 'Maharashtra',
-            # Add more mappings as needed
-        }
+        self.language_detector = LanguageDetector()
+
+        # Source names and states of known news domains
+        self.domains = get_domain_registry()
 
     def _extract_source(self, url: str) -> str:
         """Extract source name from URL"""
         try:
-            ext = tldextract.extract(url)
-            domain = f"{ext.domain}.{ext.suffix}"
-            # Map common domains to their proper names
-            source_mapping = {
-                'thehindu.com': 'The Hindu',
-                'timesofindia.indiatimes.com': 'Times of India',
-                'jagran.com': 'Dainik Jagran',
-                'dinamalar.com': 'Dinamalar',
-                'dinakaran.com': 'Dinakaran',
-                'amarujala.com': 'Amar Ujala',
-                'bhaskar.com': 'Dainik Bhaskar',
-                'lokmat.com': 'Lokmat',
-                # Add more mappings as needed
-            }
-            return source_mapping.get(domain, domain)
+            return self.domains.source_name(url)
         except Exception as e:
             logger.error(f"Error extracting source from URL {url}: {str(e)}")
             return urlparse(url).netloc
@@ -81,50 +69,28 @@ class ContentExtractor:
     def _extract_state(self, url: str, content: str = '') -> str:
         """Extract state information from URL and content"""
         try:
-            # First check domain-based mapping
-            domain = tldextract.extract(url).registered_domain
-            if domain in self.state_mapping:
-                return self.state_mapping[domain]
-
-            # Look for state mentions in URL path
-            path = urlparse(url).path.lower()
-            state_keywords = {
-                'tamil-nadu': 'Tamil Nadu',
-                'kerala': 'Kerala',
-                'karnataka': 'Karnataka',
-                'andhra-pradesh': 'Andhra Pradesh',
-                'maharashtra': 'Maharashtra',
-                'delhi': 'Delhi',
-                'uttar-pradesh': 'Uttar Pradesh',
-                'west-bengal': 'West Bengal',
-                # Add more state mappings
-            }
-            
-            for keyword, state in state_keywords.items():
-                if keyword in path:
-                    return state
-
-            # Default to 'All' if no specific state is found
-            return 'All'
+            return self.domains.state(url)
         except Exception as e:
             logger.error(f"Error extracting state from URL {url}: {str(e)}")
             return 'All'
 
-    def _parse_date(self, date_str: str, html_content: str = None) -> Optional[str]:
+    def _parse_date(self, date_str: str, tree: Optional[HtmlElement] = None) -> Optional[str]:
         """Parse date string to ISO format with multiple fallbacks"""
-        if not date_str and html_content:
+        if not date_str and tree is not None:
             try:
                 # Try to find date in meta tags
-                soup = BeautifulSoup(html_content, 'lxml')
-                meta_dates = soup.find_all('meta', attrs={'property': ['article:published_time', 'og:published_time', 'published_time']})
+                meta_dates = tree.xpath(
+                    '//meta[@property="article:published_time" or @property="og:published_time" '
+                    'or @property="published_time"]/@content'
+                )
                 if meta_dates:
-                    date_str = meta_dates[0].get('content', '')
+                    date_str = meta_dates[0]
                 else:
                     # Try to find date in schema.org metadata
-                    schema = soup.find('script', type='application/ld+json')
+                    schema = tree.xpath('//script[@type="application/ld+json"]/text()')
                     if schema:
                         try:
-                            data = json.loads(schema.string)
+                            data = json.loads(schema[0])
                             if isinstance(data, dict):
                                 date_str = data.get('datePublished', '')
                         except json.JSONDecodeError:
@@ -153,87 +119,65 @@ class ContentExtractor:
         text = ' '.join(text.split())
         return text.strip()
 
-    def _detect_language(self, text: str, meta_lang: str = None) -> str:
-        """Detect language of the content"""
-        if meta_lang:
-            return meta_lang.lower()[:2]
-        
-        try:
-            # Try to detect language from content
-            from langdetect import detect
-            return detect(text)
-        except Exception as e:
-            logger.warning(f"Language detection failed: {str(e)}")
-            return 'en'  # Default to English
+    def _detect_language(self, text: str, meta_lang: str = None, expected_language: str = None) -> Tuple[str, str]:
+        """Detect language of the content, returning the language and the detection tier that decided it"""
+        return self.language_detector.detect(text, (expected_language, meta_lang))
 
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text using basic NLP techniques"""
-        try:
-            from nltk.tokenize import word_tokenize
-            from nltk.corpus import stopwords
-            from nltk.tag import pos_tag
-            import nltk
-            
-            # Download required NLTK data if not already present
-            try:
-                nltk.data.find('tokenizers/punkt')
-            except LookupError:
-                nltk.download('punkt', quiet=True)
-            try:
-                nltk.data.find('taggers/averaged_perceptron_tagger')
-            except LookupError:
-                nltk.download('averaged_perceptron_tagger', quiet=True)
+    def _download(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """Stream the raw bytes of an HTML page in a single attempt, along with the charset declared by the server"""
+        raw, content_type = http_client.download(url)
+        charset = re.search(r'charset=([\w-]+)', content_type)
+        return raw, charset.group(1) if charset else None
+
+    def _sniff_encoding(self, raw: bytes, declared: Optional[str] = None) -> str:
+        """Pick the page encoding from its byte order mark, the server's charset or a meta tag, defaulting to UTF-8"""
+        for bom, encoding in BOMS:
+            if raw.startswith(bom):
+                return encoding
+        match = META_CHARSET.search(raw, 0, CHARSET_SNIFF_BYTES)
+        candidates = (declared, match.group(1).decode('ascii') if match else None)
+        for candidate in candidates:
+            if not candidate:
+                continue
             try:
-                nltk.data.find('corpora/stopwords')
+                return codecs.lookup(candidate).name
             except LookupError:
-                nltk.download('stopwords', quiet=True)
+                logger.debug(f"Ignoring unknown charset {candidate}")
+        return 'utf-8'
 
-            # Tokenize and tag parts of speech
-            tokens = word_tokenize(text.lower())
-            tagged = pos_tag(tokens)
-            
-            # Get English stop words
-            stop_words = set(stopwords.words('english'))
-            
-            # Extract nouns and adjectives that aren't stop words
-            keywords = [word for word, tag in tagged 
-                       if word not in stop_words 
-                       and len(word) > 2
-                       and tag.startswith(('NN', 'JJ'))  # Nouns and adjectives
-                       and word.isalnum()]  # Only alphanumeric words
-            
-            # Return unique keywords
-            return list(set(keywords))[:10]  # Limit to top 10 keywords
+    def _is_retryable(self, error: httpx.HTTPError) -> bool:
+        """Whether a download error is likely transient (network failure, throttling or server error)"""
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        return isinstance(error, httpx.TransportError)
+
+    def _parse_html(self, raw: bytes, encoding: Optional[str] = None) -> Optional[HtmlElement]:
+        """Parse raw HTML bytes once into the lxml document shared by every extraction stage"""
+        try:
+            # libxml2 would otherwise fall back to Latin-1 for pages without a declaration
+            parser = lxml.html.HTMLParser(encoding=self._sniff_encoding(raw, encoding))
+            return lxml.html.document_fromstring(raw, parser=parser)
         except Exception as e:
-            logger.warning(f"Keyword extraction failed: {str(e)}")
-            return []
+            logger.error(f"Failed to parse HTML: {str(e)}")
+            return None
 
-    def _retry_download(self, url: str, max_retries: int = 3, delay: int = 2) -> Optional[str]:
-        """Download URL content with retries"""
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, headers=self.headers, timeout=10)
-                response.raise_for_status()
-                return response.text
-            except requests.RequestException as e:
-                if attempt == max_retries - 1:
-                    logger.error(f"Failed to download {url} after {max_retries} attempts: {str(e)}")
-                    return None
-                time.sleep(delay * (attempt + 1))
-        return None
-
-    def _extract_with_trafilatura(self, url: str) -> Optional[Dict]:
-        """Extract content using trafilatura with enhanced error handling"""
+    def _decode_html(self, raw: bytes, tree: HtmlElement) -> str:
+        """Decode raw HTML bytes using the encoding lxml detected while parsing"""
+        encoding = tree.getroottree().docinfo.encoding or 'utf-8'
+        try:
+            return raw.decode(encoding, errors='replace')
+        except LookupError:
+            return raw.decode('utf-8', errors='replace')
+
+    def _extract_with_trafilatura(self, url: str, tree: HtmlElement, expected_language: Optional[str] = None) -> Optional[Dict]:
+        """Extract content using trafilatura from the shared parsed document"""
         try:
-            # Download with retries
-            downloaded = trafilatura.fetch_url(url)
-            if not downloaded:
-                downloaded = self._retry_download(url)
-                if not downloaded:
-                    return None
+            # Read meta tags before trafilatura, which works on copies of the tree
+            date = self._parse_date('', tree)
+            html_lang = tree.get('lang')
 
             # Extract content
-            result = trafilatura.extract(downloaded, **self.trafilatura_config)
+            result = trafilatura.extract(tree, url=url, **self.trafilatura_config)
             if not result:
                 return None
 
@@ -249,11 +193,12 @@ class ContentExtractor:
             source = self._extract_source(url)
             state = self._extract_state(url, text)
             
-            # Get the date with fallback to HTML content
-            date = self._parse_date(result.get('date', ''), downloaded)
+            # Prefer the date found by trafilatura, falling back to the meta tags
+            if result.get('date'):
+                date = self._parse_date(result['date'])
             
             # Detect language
-            language = self._detect_language(text, result.get('language'))
+            language, language_tier = self._detect_language(text, result.get('language') or html_lang, expected_language)
 
             return {
                 'title': result.get('title', ''),
@@ -264,6 +209,7 @@ class ContentExtractor:
                 'source': source,
                 'state': state,
                 'language': language,
+                'language_tier': language_tier,
                 'summary': result.get('description', '') or text[:200] + '...' if text else '',
                 'image_urls': result.get('images', []) if isinstance(result.get('images'), list) else [],
                 'extracted_by': 'trafilatura'
@@ -272,22 +218,13 @@ class ContentExtractor:
             logger.error(f"Trafilatura extraction failed for {url}: {str(e)}")
             return None
 
-    def _extract_with_newspaper(self, url: str) -> Optional[Dict]:
-        """Extract content using newspaper3k with enhanced error handling"""
+    def _extract_with_newspaper(
+        self, url: str, html: str, tree: HtmlElement, expected_language: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Extract content using newspaper3k from the already downloaded HTML"""
         try:
             article = Article(url, config=self.newspaper_config)
-            
-            # Download with retries
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    article.download()
-                    break
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        logger.error(f"Failed to download article after {max_retries} attempts: {str(e)}")
-                        return None
-                    time.sleep(2 * (attempt + 1))
+            article.download(input_html=html)
 
             # Parse article
             article.parse()
@@ -299,14 +236,14 @@ class ContentExtractor:
             source = self._extract_source(url)
             state = self._extract_state(url, text)
             
-            # Get the date with fallback to HTML content
+            # Get the date with fallback to the shared document's meta tags
             date = self._parse_date(
                 article.publish_date.isoformat() if article.publish_date else '',
-                article.html
+                tree
             )
             
             # Detect language
-            language = self._detect_language(text, article.meta_lang)
+            language, language_tier = self._detect_language(text, article.meta_lang or tree.get('lang'), expected_language)
             
             # Try NLP for summary
             summary = ''
@@ -326,6 +263,7 @@ class ContentExtractor:
                 'source': source,
                 'state': state,
                 'language': language,
+                'language_tier': language_tier,
                 'summary': summary,
                 'image_urls': [article.top_image] if article.top_image else [],
                 'extracted_by': 'newspaper3k'
@@ -334,53 +272,146 @@ class ContentExtractor:
             logger.error(f"Newspaper3k extraction failed for {url}: {str(e)}")
             return None
 
-    def extract_content(self, url: str) -> Dict:
-        """Extract content from a URL using both trafilatura and newspaper3k"""
-        start_time = time.time()
-        
-        # Validate URL
-        try:
-            parsed_url = urlparse(url)
-            if not all([parsed_url.scheme, parsed_url.netloc]):
-                return {
-                    'url': url,
-                    'extraction_time': datetime.utcnow().isoformat(),
-                    'extraction_success': False,
-                    'error': 'Invalid URL format'
-                }
-        except Exception:
-            return {
-                'url': url,
-                'extraction_time': datetime.utcnow().isoformat(),
-                'extraction_success': False,
-                'error': 'Invalid URL'
-            }
+    def _error_result(self, url: str, error: str, start_time: float, metrics: Optional[Dict] = None, **extra) -> Dict:
+        """Build the result returned when no content could be extracted"""
+        result = {
+            'url': url,
+            'extraction_time': datetime.utcnow().isoformat(),
+            'extraction_success': False,
+            'error': error,
+            'processing_time': round(time.time() - start_time, 2),
+            **extra
+        }
+        if metrics is not None:
+            result['metrics'] = metrics
+        return result
 
-        # Try trafilatura first
-        content = self._extract_with_trafilatura(url)
-        
-        # If trafilatura fails or returns minimal content, try newspaper3k
-        if not content or not content.get('text'):
-            logger.info(f"Trafilatura failed or returned minimal content for {url}, trying newspaper3k")
-            content = self._extract_with_newspaper(url)
+    def _extract_document(
+        self,
+        url: str,
+        raw: bytes,
+        encoding: Optional[str],
+        metrics: Dict,
+        expected_language: Optional[str] = None,
+        strategies: Optional[List[str]] = None
+    ) -> Optional[Dict]:
+        """Parse raw page bytes once and run the extraction strategies over the shared document in the given order"""
+        parse_start = time.process_time()
+        tree = self._parse_html(raw, encoding)
+        metrics['parse_cpu_seconds'] = round(time.process_time() - parse_start, 4)
+        if tree is None:
+            return None
+
+        # Stop at the first strategy that returns text; the caller learns from the reported attempts
+        content = None
+        html = None
+        attempts = []
+        for strategy in strategies or DEFAULT_STRATEGIES:
+            strategy_start = time.perf_counter()
+            if strategy == 'trafilatura':
+                content = self._extract_with_trafilatura(url, tree, expected_language)
+            elif strategy == 'newspaper3k':
+                if html is None:
+                    html = self._decode_html(raw, tree)
+                content = self._extract_with_newspaper(url, html, tree, expected_language)
+            else:
+                logger.warning(f"Unknown extraction strategy {strategy}")
+                continue
+            success = bool(content and content.get('text'))
+            attempts.append({
+                'strategy': strategy,
+                'success': success,
+                'seconds': round(time.perf_counter() - strategy_start, 4)
+            })
+            if success:
+                break
+            logger.info(f"{strategy} failed or returned minimal content for {url}")
+        metrics['strategy_attempts'] = attempts
+        if content:
+            metrics['language_tier'] = content.pop('language_tier', None)
+            content['canonical_url'] = find_canonical_url(tree, url)
+        return content
 
-        # Prepare the final result
+    def _finish(self, url: str, content: Optional[Dict], start_time: float, metrics: Dict) -> Dict:
+        """Add metadata to a successful extraction or describe the failure"""
         if content and content.get('text'):
-            # Add metadata
             content.update({
                 'url': url,
                 'extraction_time': datetime.utcnow().isoformat(),
                 'extraction_success': True,
-                'processing_time': round(time.time() - start_time, 2)
+                'processing_time': round(time.time() - start_time, 2),
+                'metrics': metrics
             })
-        else:
-            # Return error information if both methods fail
-            content = {
-                'url': url,
-                'extraction_time': datetime.utcnow().isoformat(),
-                'extraction_success': False,
-                'error': 'Content extraction failed with both methods',
-                'processing_time': round(time.time() - start_time, 2)
-            }
+            return content
+        # Return error information if both methods fail
+        return self._error_result(url, 'Content extraction failed with both methods', start_time, metrics)
+
+    def extract_content(
+        self, url: str, expected_language: Optional[str] = None, strategies: Optional[List[str]] = None
+    ) -> Dict:
+        """Extract content from a URL with trafilatura and newspaper3k, trying strategies in the given order"""
+        start_time = time.time()
         
-        return content 
\ No newline at end of file
+        # Validate URL
+        try:
+            parsed_url = urlparse(url)
+            if not all([parsed_url.scheme, parsed_url.netloc]):
+                return self._error_result(url, 'Invalid URL format', start_time)
+        except Exception:
+            return self._error_result(url, 'Invalid URL', start_time)
+
+        # Download and parse the page once for every extraction stage
+        cpu_start = time.process_time()
+        http_before = http_client.stats.totals()
+        metrics = {'downloads': 0, 'bytes_downloaded': 0, 'parse_cpu_seconds': 0.0}
+        content = None
+        download_error = None
+        try:
+            raw, encoding = self._download(url)
+        except httpx.HTTPError as e:
+            # Retries are scheduled by the caller instead of sleeping here
+            logger.warning(f"Failed to download {url}: {str(e)}")
+            download_error = e
+
+        if download_error is None:
+            metrics['downloads'] = 1
+            metrics['bytes_downloaded'] = len(raw)
+            self._cache_page(url, raw, encoding)
+            content = self._extract_document(url, raw, encoding, metrics, expected_language, strategies)
+        metrics['extraction_cpu_seconds'] = round(time.process_time() - cpu_start, 4)
+        http_after = http_client.stats.totals()
+        metrics['http_requests'] = http_after['requests'] - http_before['requests']
+        metrics['http_new_connections'] = http_after['new_connections'] - http_before['new_connections']
+
+        if download_error is not None:
+            return self._error_result(
+                url, f'Download failed: {str(download_error)}', start_time, metrics,
+                retryable=self._is_retryable(download_error)
+            )
+        return self._finish(url, content, start_time, metrics)
+
+    def extract_cached(self, url: str, expected_language: Optional[str] = None) -> Optional[Dict]:
+        """Re-run extraction over the cached page of a URL without any network access"""
+        cache = get_html_cache()
+        cached = cache.get(canonicalize_url(url)) if cache is not None else None
+        if cached is None:
+            return None
+
+        start_time = time.time()
+        cpu_start = time.process_time()
+        raw, encoding = cached
+        metrics = {'downloads': 0, 'bytes_downloaded': 0, 'parse_cpu_seconds': 0.0}
+        content = self._extract_document(url, raw, encoding, metrics, expected_language)
+        metrics['extraction_cpu_seconds'] = round(time.process_time() - cpu_start, 4)
+        return self._finish(url, content, start_time, metrics)
+
+    def _cache_page(self, url: str, raw: bytes, encoding: Optional[str]) -> None:
+        """Keep the raw page so it can be re-extracted later without refetching"""
+        cache = get_html_cache()
+        if cache is None:
+            return
+        try:
+            # Keyed by canonical URL so tracking and AMP variants of a story share one entry
+            cache.put(canonicalize_url(url), raw, encoding)
+        except Exception as e:
+            logger.warning(f"Failed to cache page {url}: {str(e)}")
@@ -1,8 +1,26 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from . import models
-from typing import Optional, Dict, List
+from sqlalchemy.orm import Session, Query, load_only, undefer_group
+from sqlalchemy import and_, case, cast, func, or_, tuple_
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, REGCONFIG
+from . import feed_stats, models
+from typing import Optional, Dict, List, Sequence, Tuple
 from datetime import datetime
+import base64
+import json
+
+# Columns list endpoints return by default; article bodies are left to GET /feeds/{id}
+FEED_SUMMARY_FIELDS = (
+    'id', 'title', 'description', 'link', 'published_date', 'source', 'language', 'region', 'state',
+    'author', 'image_urls', 'keywords', 'topics', 'cluster_id', 'is_duplicate', 'summary', 'extraction_success'
+)
+FEED_FIELDS = FEED_SUMMARY_FIELDS + (
+    'content', 'content_html', 'extracted_by', 'extraction_time', 'topics_version', 'created_at', 'updated_at'
+)
+# JSON list columns returned as [] when empty
+FEED_LIST_FIELDS = {'image_urls', 'keywords', 'topics'}
+# ts_headline options for search result snippets
+SNIPPET_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2'
+# Columns every page loads to build its cursor
+FEED_CURSOR_FIELDS = ('id', 'published_date')
 
 def get_articles(
     db: Session,
@@ -29,8 +47,207 @@ def get_articles(
 def get_article(db: Session, article_id: int) -> Optional[models.Article]:
     return db.query(models.Article).filter(models.Article.id == article_id).first()
 
-def get_feeds(db: Session, skip: int = 0, limit: int = 100) -> List[models.Feed]:
-    return db.query(models.Feed).offset(skip).limit(limit).all()
+def _encode_position(position: List) -> str:
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def _decode_position(cursor: str) -> List:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(position, list) or len(position) != 2:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return position
+
+def encode_cursor(feed: models.Feed) -> str:
+    """Opaque cursor pointing just past a feed in (published_date, id) order"""
+    return _encode_position([feed.published_date.isoformat(), feed.id])
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Return the (published_date, id) a cursor points past; raises ValueError for malformed cursors"""
+    published_date, feed_id = _decode_position(cursor)
+    try:
+        return datetime.fromisoformat(published_date), int(feed_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Turn a comma-separated fields= value into Feed columns; raises ValueError for unknown names"""
+    if not fields:
+        return FEED_SUMMARY_FIELDS
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(',') if name.strip()))
+    unknown = [name for name in names if name not in FEED_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return names or FEED_SUMMARY_FIELDS
+
+def serialize_feed(feed: models.Feed, fields: Sequence[str] = FEED_SUMMARY_FIELDS) -> Dict:
+    """Response dict holding the given columns of a feed"""
+    data = {}
+    for name in fields:
+        value = getattr(feed, name)
+        if name in FEED_LIST_FIELDS:
+            value = value or []
+        elif name == 'cluster_id' and value is not None:
+            # 64-bit ids lose precision as JSON numbers in JavaScript
+            value = str(value)
+        data[name] = value
+    return data
+
+def get_feed(db: Session, feed_id: int) -> Optional[models.Feed]:
+    """Return a feed with its deferred content columns loaded"""
+    return (
+        db.query(models.Feed)
+        .options(undefer_group('content'))
+        .filter(models.Feed.id == feed_id)
+        .first()
+    )
+
+def filter_feeds(
+    query: Query,
+    language: Optional[str] = None,
+    region: Optional[str] = None,
+    state: Optional[str] = None,
+    source: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cluster_id: Optional[int] = None,
+    collapse_duplicates: bool = False
+) -> Query:
+    if source:
+        query = query.filter(models.Feed.source == source)
+    if date_from:
+        query = query.filter(models.Feed.published_date >= date_from)
+    if date_to:
+        query = query.filter(models.Feed.published_date <= date_to)
+    if language:
+        query = query.filter(models.Feed.language == language)
+    if region:
+        query = query.filter(models.Feed.region == region)
+    if state:
+        query = query.filter(models.Feed.state == state)
+    if cluster_id is not None:
+        query = query.filter(models.Feed.cluster_id == cluster_id)
+    if collapse_duplicates:
+        query = query.filter(models.Feed.is_duplicate.is_(False))
+    return query
+
+def _feeds_after(query: Query, limit: int, published_date: Optional[datetime], last_id: Optional[int]) -> List[models.Feed]:
+    """Up to limit feeds after a position (from the start when last_id is None), newest first"""
+    if last_id is not None:
+        query = query.filter(tuple_(models.Feed.published_date, models.Feed.id) < (published_date, last_id))
+    return query.order_by(models.Feed.published_date.desc(), models.Feed.id.desc()).limit(limit).all()
+
+def get_feeds(
+    db: Session,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    fields: Sequence[str] = FEED_SUMMARY_FIELDS,
+    **filters
+) -> Tuple[List[models.Feed], Optional[str]]:
+    """Return a page of feeds, newest first, and the cursor of the next page (None on the last page)
+
+    Feeds are paged by a (published_date, id) row comparison, so every page is a range scan on the
+    composite indexes however deep it is. skip is only kept for older clients.
+    Only the given columns (and those of the cursor) are loaded.
+    """
+    columns = dict.fromkeys((*FEED_CURSOR_FIELDS, *fields))
+    query = db.query(models.Feed).options(load_only(*(getattr(models.Feed, name) for name in columns)))
+    query = filter_feeds(query, **filters)
+    if skip and not cursor:
+        feeds = (
+            query.order_by(models.Feed.published_date.desc(), models.Feed.id.desc())
+            .offset(skip)
+            .limit(limit + 1)
+            .all()
+        )
+    else:
+        feeds = _feeds_after(query, limit + 1, *(decode_cursor(cursor) if cursor else (None, None)))
+
+    if len(feeds) > limit:
+        return feeds[:limit], encode_cursor(feeds[limit - 1])
+    return feeds, None
+
+def _search_match(text: str):
+    """Return the match condition of a websearch-style query and the tsquery of each row's language
+
+    Every row is matched only against the query parsed with its own configuration, so operators like
+    -excluded and "exact phrase" keep their meaning; each branch is a separate scan of the GIN index.
+    """
+    configs = dict.fromkeys((*models.SEARCH_CONFIGS.values(), models.DEFAULT_SEARCH_CONFIG))
+    queries = {config: func.websearch_to_tsquery(cast(config, REGCONFIG), text) for config in configs}
+    language = models.Feed.language
+    matches = models.Feed.search_vector.op('@@')
+
+    conditions = [
+        and_(language == code, matches(queries[config]))
+        for code, config in models.SEARCH_CONFIGS.items()
+    ]
+    # Like the CASE in the vector's definition, unknown and missing languages use the default configuration
+    conditions.append(and_(
+        or_(language.is_(None), language.notin_(list(models.SEARCH_CONFIGS))),
+        matches(queries[models.DEFAULT_SEARCH_CONFIG])
+    ))
+    row_query = case(
+        *((language == code, queries[config]) for code, config in models.SEARCH_CONFIGS.items()),
+        else_=queries[models.DEFAULT_SEARCH_CONFIG]
+    )
+    return or_(*conditions), row_query
+
+def search_feeds(
+    db: Session,
+    text: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    fields: Sequence[str] = FEED_SUMMARY_FIELDS,
+    **filters
+) -> Tuple[List[Dict], Optional[str]]:
+    """Return a page of feeds matching a search, best match first, with highlighted snippets, and the next cursor
+
+    Matches come from the GIN index on search_vector. Pages continue from the (rank, id) of the previous
+    page's last result, and snippets are only built for the rows of the returned page.
+    """
+    match, tsquery = _search_match(text)
+    # ts_rank returns a real; as double precision it survives the JSON round trip through the cursor exactly
+    rank = cast(func.ts_rank(models.Feed.search_vector, tsquery), DOUBLE_PRECISION)
+    page = filter_feeds(db.query(models.Feed.id.label('id'), rank.label('rank')).filter(match), **filters)
+    if cursor:
+        last_rank, last_id = _decode_position(cursor)
+        if not isinstance(last_rank, (int, float)) or not isinstance(last_id, int):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        page = page.filter(tuple_(rank, models.Feed.id) < (last_rank, last_id))
+    page = page.order_by(rank.desc(), models.Feed.id.desc()).limit(limit + 1).subquery()
+
+    config = case(
+        *((models.Feed.language == language, cast(name, REGCONFIG)) for language, name in models.SEARCH_CONFIGS.items()),
+        else_=cast(models.DEFAULT_SEARCH_CONFIG, REGCONFIG)
+    )
+    snippet = func.ts_headline(
+        config,
+        func.left(
+            func.coalesce(models.Feed.content, models.Feed.summary, models.Feed.description, ''),
+            models.SEARCH_CONTENT_CHARS
+        ),
+        tsquery,
+        SNIPPET_OPTIONS
+    )
+    rows = (
+        db.query(models.Feed, page.c.rank, snippet.label('snippet'))
+        .options(load_only(*(getattr(models.Feed, name) for name in dict.fromkeys(('id', *fields)))))
+        .join(page, models.Feed.id == page.c.id)
+        .order_by(page.c.rank.desc(), page.c.id.desc())
+        .all()
+    )
+
+    results = [
+        {**serialize_feed(feed, fields), 'rank': feed_rank, 'snippet': feed_snippet}
+        for feed, feed_rank, feed_snippet in rows[:limit]
+    ]
+    if len(rows) > limit:
+        last_feed, last_rank, _ = rows[limit - 1]
+        return results, _encode_position([last_rank, last_feed.id])
+    return results, None
 
 def create_feed(db: Session, name: str, url: str, language: str, region: str, state: str) -> models.Feed:
     feed = models.Feed(
@@ -46,34 +263,8 @@ def create_feed(db: Session, name: str, url: str, language: str, region: str, st
     return feed
 
 def get_stats(db: Session) -> Dict:
-    """Get statistics about articles and feeds"""
-    stats = {
-        "total_articles": db.query(func.count(models.Article.id)).scalar(),
-        "total_feeds": db.query(func.count(models.Feed.id)).scalar(),
-        "articles_by_language": {},
-        "articles_by_region": {},
-        "articles_by_state": {}
-    }
-    
-    # Articles by language
-    lang_stats = db.query(
-        models.Feed.language,
-        func.count(models.Article.id)
-    ).join(models.Article).group_by(models.Feed.language).all()
-    stats["articles_by_language"] = dict(lang_stats)
-    
-    # Articles by region
-    region_stats = db.query(
-        models.Feed.region,
-        func.count(models.Article.id)
-    ).join(models.Article).group_by(models.Feed.region).all()
-    stats["articles_by_region"] = dict(region_stats)
-    
-    # Articles by state
-    state_stats = db.query(
-        models.Feed.state,
-        func.count(models.Article.id)
-    ).join(models.Article).group_by(models.Feed.state).all()
-    stats["articles_by_state"] = dict(state_stats)
-    
-    return stats 
\ No newline at end of file
+    """Get statistics about articles and feeds from the counters kept by the feed writer"""
+    stats = feed_stats.read_stats(db)
+    # Articles are stored as rows of the feeds table
+    stats["total_feeds"] = stats["total_articles"]
+    return stats
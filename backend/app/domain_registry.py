@@ -0,0 +1,182 @@
+import json
+import logging
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+import tldextract
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent / 'data'
+SOURCES_FILE = DATA_DIR / 'sources.json'
+STATE_KEYWORDS_FILE = DATA_DIR / 'state_keywords.json'
+
+# States that do not narrow an article down
+NATIONAL_STATES = {None, '', 'All'}
+
+# Bundled public suffix snapshot only; the default extractor downloads the list on first use
+_suffix_extractor = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+class KeywordMatcher:
+    """Aho-Corasick automaton finding every keyword of a fixed set in one pass over a text"""
+
+    def __init__(self, keywords: Dict[str, str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # node -> (keyword length, value) of every keyword ending there, longest first
+        self._output: List[List[Tuple[int, str]]] = [[]]
+        for keyword, value in keywords.items():
+            self._insert(keyword.lower(), value)
+        self._link()
+
+    def _insert(self, keyword: str, value: str) -> None:
+        node = 0
+        for char in keyword:
+            if char not in self._goto[node]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = len(self._goto) - 1
+            node = self._goto[node][char]
+        self._output[node].append((len(keyword), value))
+
+    def _link(self) -> None:
+        """Compute failure links breadth first and merge the outputs of each node's suffixes"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = sorted(self._output[child] + self._output[self._fail[child]], reverse=True)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, value) of every keyword occurrence in order of its end position"""
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for length, value in self._output[node]:
+                yield end - length, end, value
+
+    def first_word(self, text: str) -> Optional[str]:
+        """Value of the leftmost (then longest) keyword that stands as a whole word, e.g. a path segment"""
+        best = None
+        for start, end, value in self.finditer(text):
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end].isalnum():
+                continue
+            if best is None or (start, start - end) < best[:2]:
+                best = (start, start - end, value)
+        return best[2] if best else None
+
+def _host(url: str) -> str:
+    """Lowercased host of a URL (or bare host) without www. and trailing dots"""
+    host = (urlsplit(url if '//' in url else f'//{url}').hostname or '').rstrip('.')
+    return host[4:] if host.startswith('www.') else host
+
+def _resolve_path(path: str) -> Path:
+    config_path = Path(path)
+    # Relative paths are relative to the backend directory, like the scheduler's
+    return config_path if config_path.is_absolute() else Path(__file__).parent.parent / config_path
+
+def _load_json(path: Path) -> Dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.error(f"Failed to load domain metadata from {path}: {str(e)}")
+        return {}
+
+class DomainRegistry:
+    """Source name, state, language and region of each news domain, compiled from feeds_config and the mapping files"""
+
+    def __init__(self, feeds_config: Optional[Dict] = None, sources: Optional[Dict] = None, state_keywords: Optional[Dict] = None):
+        if feeds_config is None:
+            feeds_config = _load_json(_resolve_path(settings.FEED_CONFIG_PATH))
+        if sources is None:
+            sources = _load_json(SOURCES_FILE)
+        if state_keywords is None:
+            state_keywords = _load_json(STATE_KEYWORDS_FILE)
+
+        self._domains: Dict[str, Dict] = self._compile(feeds_config, sources)
+        self._states = KeywordMatcher(state_keywords)
+        self._registered: Dict[str, str] = {}
+        logger.info(f"Compiled domain registry with {len(self._domains)} domains and {len(state_keywords)} state keywords")
+
+    @staticmethod
+    def _compile(feeds_config: Dict, sources: Dict) -> Dict[str, Dict]:
+        """Merge the attributes of every feed of a host; attributes the feeds disagree on are left unset"""
+        values = defaultdict(lambda: defaultdict(set))
+        for config in feeds_config.values():
+            host = _host(config.get('url', ''))
+            if not host:
+                continue
+            for key in ('language', 'region', 'state'):
+                values[host][key].add(config.get(key))
+
+        domains = {}
+        for host, attributes in values.items():
+            domains[host] = {
+                key: next(iter(options)) if len(options) == 1 else None
+                for key, options in attributes.items()
+            }
+        for domain, metadata in sources.items():
+            domains.setdefault(_host(domain), {}).update(metadata)
+        return domains
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Metadata of the most specific known domain a URL belongs to, trying the host and then its parents"""
+        labels = _host(url).split('.')
+        for start in range(len(labels) - 1):
+            metadata = self._domains.get('.'.join(labels[start:]))
+            if metadata is not None:
+                return metadata
+        return None
+
+    def registered_domain(self, url: str) -> str:
+        """Registrable domain of a URL from the bundled public suffix list, memoised per host"""
+        host = _host(url)
+        domain = self._registered.get(host)
+        if domain is None:
+            domain = _suffix_extractor(host).registered_domain or host
+            self._registered[host] = domain
+        return domain
+
+    def source_name(self, url: str) -> str:
+        metadata = self.lookup(url)
+        if metadata and metadata.get('name'):
+            return metadata['name']
+        return self.registered_domain(url)
+
+    def state(self, url: str, feed_state: Optional[str] = None) -> str:
+        """State of an article: the feed's or domain's own state, else a state named in the URL path, else 'All'"""
+        if feed_state not in NATIONAL_STATES:
+            return feed_state
+        metadata = self.lookup(url) or {}
+        if metadata.get('state') not in NATIONAL_STATES:
+            return metadata['state']
+        return self._states.first_word(urlsplit(url).path.lower()) or feed_state or 'All'
+
+
+_registry: Optional[DomainRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_domain_registry() -> DomainRegistry:
+    """Return the process-wide registry, compiling it on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = DomainRegistry()
+        return _registry
@@ -0,0 +1,84 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Extractor owned by each worker process, created once by the pool initializer
+_worker_extractor = None
+
+
+def _init_worker() -> None:
+    """Load the NLP runtime and create the per-process content extractor"""
+    global _worker_extractor
+    from .content_extractor import ContentExtractor
+    from .nlp import get_runtime
+    get_runtime()
+    _worker_extractor = ContentExtractor()
+
+
+def _extract_in_worker(url: str, expected_language: Optional[str] = None, strategies: Optional[List[str]] = None) -> Dict:
+    """Run content extraction for a single URL inside a worker process"""
+    return _worker_extractor.extract_content(url, expected_language, strategies)
+
+
+def _reextract_in_worker(url: str, expected_language: Optional[str] = None) -> Optional[Dict]:
+    """Re-run extraction over a cached page inside a worker process"""
+    return _worker_extractor.extract_cached(url, expected_language)
+
+
+def _topics_in_worker(texts: List[str]) -> List[List[str]]:
+    """Extract the named entity topics of a batch of texts inside a worker process"""
+    from .nlp import get_runtime
+    return get_runtime().entities_many(texts)
+
+
+class ExtractionPool:
+    """Process pool running CPU-bound article extraction outside the API process"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or settings.EXTRACTION_WORKERS or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use"""
+        if self._executor is None:
+            # Spawn instead of fork: the parent runs uvicorn and the scheduler thread
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+            logger.info(f"Started extraction pool with {self.max_workers} workers")
+        return self._executor
+
+    def _submit(self, fn, *args) -> Future:
+        """Queue a job, restarting the pool if a worker died"""
+        try:
+            return self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            logger.warning("Extraction pool is broken, restarting it")
+            self.shutdown(wait=False)
+            return self._get_executor().submit(fn, *args)
+
+    def submit(self, url: str, expected_language: Optional[str] = None, strategies: Optional[List[str]] = None) -> Future:
+        """Queue a URL for download and extraction, trying the extraction strategies in the given order"""
+        return self._submit(_extract_in_worker, url, expected_language, strategies)
+
+    def submit_reextract(self, url: str, expected_language: Optional[str] = None) -> Future:
+        """Queue a URL for re-extraction from the HTML cache"""
+        return self._submit(_reextract_in_worker, url, expected_language)
+
+    def submit_topics(self, texts: List[str]) -> Future:
+        """Queue a batch of texts for named entity topic extraction"""
+        return self._submit(_topics_in_worker, texts)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Extraction strategies in their default order, named like Feed.extracted_by
+DEFAULT_STRATEGIES = ('trafilatura', 'newspaper3k')
+
+# Counts are halved past this many attempts so old results fade out
+MAX_ATTEMPTS = 200
+
+class StrategyStats:
+    """Per-domain success and latency of each extraction strategy, used to order strategies for new articles"""
+
+    def __init__(self, stats_file: Optional[str] = None):
+        self.stats_file = settings.EXTRACTOR_STATS_FILE if stats_file is None else stats_file
+        self._lock = threading.Lock()
+        # domain -> strategy -> {'attempts', 'successes', 'seconds'}
+        self._domains: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
+        self._calls: Dict[str, int] = defaultdict(int)
+        self._load()
+
+    def _counts(self, domain: str, strategy: str) -> Dict[str, float]:
+        return self._domains[domain].setdefault(strategy, {'attempts': 0, 'successes': 0, 'seconds': 0.0})
+
+    def record(self, domain: str, strategy: str, success: bool, seconds: float) -> None:
+        with self._lock:
+            counts = self._counts(domain, strategy)
+            counts['attempts'] += 1
+            counts['successes'] += int(success)
+            counts['seconds'] += seconds
+            if counts['attempts'] > MAX_ATTEMPTS:
+                for key in counts:
+                    counts[key] /= 2
+
+    def _score(self, counts: Optional[Dict[str, float]]) -> Tuple[float, float]:
+        """Sort key: higher success rate first, then lower latency; untried strategies count as reliable"""
+        if not counts or not counts['attempts']:
+            return (-1.0, 0.0)
+        return (-counts['successes'] / counts['attempts'], counts['seconds'] / counts['attempts'])
+
+    def _failing(self, counts: Optional[Dict[str, float]]) -> bool:
+        return bool(
+            counts
+            and counts['attempts'] >= settings.EXTRACTOR_MIN_ATTEMPTS
+            and counts['successes'] / counts['attempts'] < settings.EXTRACTOR_MIN_SUCCESS_RATE
+        )
+
+    def order(self, domain: str) -> List[str]:
+        """Strategies to try for an article of a domain, best first, without those that keep failing"""
+        with self._lock:
+            strategies = self._domains.get(domain, {})
+            ranked = sorted(
+                DEFAULT_STRATEGIES,
+                key=lambda strategy: (*self._score(strategies.get(strategy)), DEFAULT_STRATEGIES.index(strategy))
+            )
+            self._calls[domain] += 1
+            # Retry skipped strategies now and then so a site that changed its markup can recover
+            if self._calls[domain] % settings.EXTRACTOR_EXPLORE_INTERVAL == 0:
+                return ranked
+            kept = [strategy for strategy in ranked if not self._failing(strategies.get(strategy))]
+            return kept or ranked
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return per-domain attempts, success rate, mean latency and skip state of every strategy"""
+        with self._lock:
+            domains = {
+                domain: {
+                    strategy: {
+                        'attempts': round(counts['attempts'], 1),
+                        'success_rate': round(counts['successes'] / counts['attempts'], 3) if counts['attempts'] else 0.0,
+                        'mean_seconds': round(counts['seconds'] / counts['attempts'], 4) if counts['attempts'] else 0.0,
+                        'skipped': self._failing(counts)
+                    }
+                    for strategy, counts in strategies.items()
+                }
+                for domain, strategies in sorted(self._domains.items())
+            }
+        return domains
+
+    def _load(self) -> None:
+        if not self.stats_file or not os.path.exists(self.stats_file):
+            return
+        try:
+            with open(self.stats_file, encoding='utf-8') as f:
+                for domain, strategies in json.load(f).items():
+                    self._domains[domain] = strategies
+            logger.info(f"Loaded extractor statistics for {len(self._domains)} domains from {self.stats_file}")
+        except Exception as e:
+            logger.error(f"Failed to load extractor statistics from {self.stats_file}: {str(e)}")
+
+    def save(self) -> None:
+        """Persist the statistics so strategy ordering survives restarts"""
+        if not self.stats_file:
+            return
+        with self._lock:
+            data = json.dumps(self._domains)
+        tmp_path = f"{self.stats_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.stats_file)
+
+
+_stats: Optional[StrategyStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_strategy_stats() -> StrategyStats:
+    """Return the process-wide statistics shared by the fetcher and the API, loading them on first use"""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = StrategyStats()
+        return _stats
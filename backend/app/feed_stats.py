@@ -0,0 +1,127 @@
+"""
+Article counters per language, region and state, maintained by the feed writer so /stats is a single small read
+
+Usage:
+    python -m app.feed_stats [--check]
+
+Recounts the feeds table and replaces the stored counters, printing every counter that had drifted;
+--check only reports the differences.
+"""
+import argparse
+import logging
+from collections import Counter
+from typing import Dict, Iterable, Tuple
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from .database import SessionLocal
+from .models import FeedStat
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ('language', 'region', 'state')
+# Dimension of the single counter of all stored articles
+TOTAL = 'total'
+# Stored value of a missing attribute, since the value is part of the primary key
+MISSING = ''
+
+def count_rows(rows: Iterable) -> Counter:
+    """(dimension, value) -> articles of freshly inserted rows carrying the dimension attributes"""
+    counts = Counter()
+    for row in rows:
+        counts[(TOTAL, MISSING)] += 1
+        for dimension in DIMENSIONS:
+            counts[(dimension, getattr(row, dimension) or MISSING)] += 1
+    return counts
+
+def count_table(db: Session, table: str = 'feeds') -> Counter:
+    """Count a table (or one of its partitions) along every dimension in a single scan"""
+    groupings = ', '.join(f"GROUPING({dimension}) AS grouped_{dimension}" for dimension in DIMENSIONS)
+    sets = ', '.join(f"({dimension})" for dimension in DIMENSIONS)
+    rows = db.execute(text(
+        f"SELECT {', '.join(DIMENSIONS)}, {groupings}, count(*) AS articles "
+        f"FROM {table} GROUP BY GROUPING SETS ((), {sets})"
+    )).mappings()
+
+    counts = Counter()
+    for row in rows:
+        grouped = [dimension for dimension in DIMENSIONS if not row[f'grouped_{dimension}']]
+        key = (grouped[0], row[grouped[0]] or MISSING) if grouped else (TOTAL, MISSING)
+        counts[key] += row['articles']
+    return counts
+
+def apply_counts(db: Session, counts: Counter, sign: int = 1) -> None:
+    """Add (or with sign=-1 subtract) counters in the caller's transaction"""
+    values = [
+        {'dimension': dimension, 'value': value, 'articles': sign * articles}
+        for (dimension, value), articles in sorted(counts.items())
+        if articles
+    ]
+    if not values:
+        return
+    # Sorted keys make concurrent writers lock the counter rows in the same order
+    stmt = insert(FeedStat).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[FeedStat.dimension, FeedStat.value],
+        set_={'articles': FeedStat.articles + stmt.excluded.articles}
+    )
+    db.execute(stmt)
+
+def _stored_counts(db: Session) -> Counter:
+    return Counter({
+        (stat.dimension, stat.value): stat.articles
+        for stat in db.query(FeedStat).filter(FeedStat.articles != 0)
+    })
+
+def read_stats(db: Session) -> Dict:
+    """Counters in the /stats response shape; articles without an attribute are listed under None"""
+    stats = {
+        'total_articles': 0,
+        **{f'articles_by_{dimension}': {} for dimension in DIMENSIONS}
+    }
+    for (dimension, value), articles in _stored_counts(db).items():
+        if dimension == TOTAL:
+            stats['total_articles'] = articles
+        elif dimension in DIMENSIONS:
+            stats[f'articles_by_{dimension}'][value or None] = articles
+    return stats
+
+def rebuild_stats(db: Session, dry_run: bool = False) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """Recount every counter from the feeds table, returning (stored, actual) of each one that differed"""
+    # Blocks writers from adding to the counters until the recount commits; rows they insert meanwhile
+    # are not visible to the recount and are added by their own increments afterwards
+    db.execute(text(f"LOCK TABLE {FeedStat.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+    actual = count_table(db)
+    stored = _stored_counts(db)
+    drift = {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in set(stored) | set(actual)
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+    if dry_run:
+        db.rollback()
+        return drift
+
+    db.query(FeedStat).delete()
+    apply_counts(db, actual)
+    db.commit()
+    logger.info(f"Rebuilt {len(actual)} feed counters, {len(drift)} had drifted")
+    return drift
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check or rebuild the article counters behind /stats")
+    parser.add_argument('--check', action='store_true', help="Only report counters that differ from a recount")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        drift = rebuild_stats(db, dry_run=args.check)
+    finally:
+        db.close()
+    for (dimension, value), (stored, actual) in sorted(drift.items()):
+        print(f"{dimension}={value or None}: stored {stored}, actual {actual}")
+    print(f"{len(drift)} counters {'differ' if args.check else 'corrected'}")
+
+if __name__ == '__main__':
+    main()
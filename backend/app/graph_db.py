@@ -47,7 +47,7 @@ class Neo4jManager:
             SET f.title = $title,
                 f.description = $description,
                 f.published_date = datetime($published_date),
-                f.content = $content,
+                f.content = coalesce($content, f.content),
                 f.summary = $summary,
                 f.author = $author,
                 f.updated_at = datetime($updated_at)
@@ -75,16 +75,17 @@ class Neo4jManager:
             RETURN f.url
             """
 
-            # Extract topics from content using NLP
-            topics = self._extract_topics(feed_data.get('content', ''))
-            
+            # Topics are extracted once during ingestion and stored with the article
+            topics = feed_data.get('topics') or []
+
             # Prepare parameters
             params = {
                 'url': feed_data['url'],
                 'title': feed_data.get('title', ''),
                 'description': feed_data.get('description', ''),
                 'published_date': feed_data.get('published_date', datetime.utcnow().isoformat()),
-                'content': feed_data.get('content', ''),
+                # Syncs from list endpoints carry no content; keep what the node already has
+                'content': feed_data.get('content'),
                 'summary': feed_data.get('summary', ''),
                 'author': feed_data.get('author', ''),
                 'source': feed_data.get('source', ''),
@@ -102,53 +103,6 @@ class Neo4jManager:
                 logger.error(f"Error creating/updating feed in Neo4j: {str(e)}")
                 return None
 
-    def _extract_topics(self, content: str) -> List[str]:
-        """Extract topics from content using NLP"""
-        try:
-            import nltk
-            from nltk.tokenize import sent_tokenize, word_tokenize
-            from nltk.tag import pos_tag
-            from nltk.chunk import ne_chunk
-            
-            # Download required NLTK data
-            try:
-                nltk.data.find('tokenizers/punkt')
-            except LookupError:
-                nltk.download('punkt', quiet=True)
-            try:
-                nltk.data.find('taggers/averaged_perceptron_tagger')
-            except LookupError:
-                nltk.download('averaged_perceptron_tagger', quiet=True)
-            try:
-                nltk.data.find('chunkers/maxent_ne_chunker')
-            except LookupError:
-                nltk.download('maxent_ne_chunker', quiet=True)
-            try:
-                nltk.data.find('corpora/words')
-            except LookupError:
-                nltk.download('words', quiet=True)
-
-            # Process the content
-            sentences = sent_tokenize(content)
-            topics = set()
-
-            for sentence in sentences:
-                tokens = word_tokenize(sentence)
-                tagged = pos_tag(tokens)
-                entities = ne_chunk(tagged)
-                
-                # Extract named entities
-                for entity in entities:
-                    if hasattr(entity, 'label'):
-                        if entity.label() in ('GPE', 'ORGANIZATION', 'PERSON'):
-                            topic = ' '.join([leaf[0] for leaf in entity.leaves()])
-                            topics.add(topic)
-
-            return list(topics)
-        except Exception as e:
-            logger.warning(f"Topic extraction failed: {str(e)}")
-            return []
-
     def get_related_feeds(self, feed_url: str, limit: int = 5) -> List[Dict]:
         """Get related feeds based on shared topics and keywords"""
         with self.driver.session() as session:
@@ -193,49 +147,6 @@ class Neo4jManager:
                 logger.error(f"Error getting trending topics: {str(e)}")
                 return []
 
-    def search_feeds(self, query: str, filters: Dict = None) -> List[Dict]:
-        """Search feeds with advanced filtering"""
-        with self.driver.session() as session:
-            # Build the query based on filters
-            base_query = """
-            MATCH (f:Feed)
-            WHERE toLower(f.title) CONTAINS toLower($query) 
-               OR toLower(f.content) CONTAINS toLower($query)
-            """
-            
-            if filters:
-                if filters.get('source'):
-                    base_query += "\nAND EXISTS { MATCH (f)-[:PUBLISHED_BY]->(:Source {name: $source}) }"
-                if filters.get('state'):
-                    base_query += "\nAND EXISTS { MATCH (f)-[:BELONGS_TO]->(:State {name: $state}) }"
-                if filters.get('language'):
-                    base_query += "\nAND EXISTS { MATCH (f)-[:WRITTEN_IN]->(:Language {code: $language}) }"
-                if filters.get('date_from'):
-                    base_query += "\nAND f.published_date >= datetime($date_from)"
-                if filters.get('date_to'):
-                    base_query += "\nAND f.published_date <= datetime($date_to)"
-
-            base_query += """
-            MATCH (f)-[:PUBLISHED_BY]->(s:Source)
-            RETURN f.url as url,
-                   f.title as title,
-                   f.summary as summary,
-                   f.published_date as published_date,
-                   s.name as source
-            ORDER BY f.published_date DESC
-            LIMIT 100
-            """
-
-            try:
-                params = {'query': query}
-                if filters:
-                    params.update(filters)
-                result = session.run(base_query, params)
-                return [dict(record) for record in result]
-            except Exception as e:
-                logger.error(f"Error searching feeds: {str(e)}")
-                return []
-
     def get_feed_stats(self) -> Dict:
         """Get statistics about feeds"""
         with self.driver.session() as session:
@@ -0,0 +1,130 @@
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class HtmlCache:
+    """Content-addressed, gzip-compressed on-disk store of raw article pages with size-based eviction"""
+
+    # Check the total size after this many writes
+    EVICTION_CHECK_INTERVAL = 50
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects = self.root / 'objects'
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS pages ('
+                'url TEXT PRIMARY KEY, digest TEXT NOT NULL, encoding TEXT, fetched_at REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS blobs ('
+                'digest TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_pages_digest ON pages (digest)')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_blobs_last_access ON blobs (last_access)')
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's index connection; extraction workers each open their own"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.root / 'index.sqlite3', timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / f"{digest[2:]}.gz"
+
+    def put(self, url: str, raw: bytes, encoding: Optional[str] = None) -> str:
+        """Store a page body under its SHA-256 digest and point the URL at it"""
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._blob_path(digest)
+        now = time.time()
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial blob
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO blobs (digest, size, last_access) VALUES (?, ?, ?)',
+                (digest, path.stat().st_size, now)
+            )
+            conn.execute(
+                'INSERT OR REPLACE INTO pages (url, digest, encoding, fetched_at) VALUES (?, ?, ?, ?)',
+                (url, digest, encoding, now)
+            )
+
+        self._writes += 1
+        if self._writes % self.EVICTION_CHECK_INTERVAL == 0:
+            self.evict()
+        return digest
+
+    def get(self, url: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Return the cached body and declared charset of a URL, or None"""
+        conn = self._connect()
+        row = conn.execute('SELECT digest, encoding FROM pages WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        digest, encoding = row
+        try:
+            with gzip.open(self._blob_path(digest), 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+        with conn:
+            conn.execute('UPDATE blobs SET last_access = ? WHERE digest = ?', (time.time(), digest))
+        return raw, encoding
+
+    def total_bytes(self) -> int:
+        return self._connect().execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def evict(self) -> int:
+        """Delete the least recently used blobs until the cache fits in max_bytes"""
+        conn = self._connect()
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return 0
+
+        evicted = 0
+        for digest, size in conn.execute('SELECT digest, size FROM blobs ORDER BY last_access').fetchall():
+            if excess <= 0:
+                break
+            try:
+                self._blob_path(digest).unlink()
+            except FileNotFoundError:
+                pass
+            with conn:
+                conn.execute('DELETE FROM blobs WHERE digest = ?', (digest,))
+                conn.execute('DELETE FROM pages WHERE digest = ?', (digest,))
+            excess -= size
+            evicted += 1
+        logger.info(f"Evicted {evicted} pages from the HTML cache")
+        return evicted
+
+
+_cache: Optional[HtmlCache] = None
+
+
+def get_html_cache() -> Optional[HtmlCache]:
+    """Return the process-wide cache, or None when HTML_CACHE_DIR is empty"""
+    global _cache
+    if _cache is None and settings.HTML_CACHE_DIR:
+        _cache = HtmlCache(settings.HTML_CACHE_DIR, settings.HTML_CACHE_MAX_BYTES)
+    return _cache
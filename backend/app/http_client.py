@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+import httpx
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+# Media types accepted for article pages; responses without a Content-Type are let through
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class ResponseRejected(httpx.HTTPError):
+    """A response abandoned before its body was read in full, because of its content type or size"""
+
+
+class ConnectionStats:
+    """Counts requests and newly opened connections to measure keep-alive reuse"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = defaultdict(lambda: {'requests': 0, 'new_connections': 0})
+        self._http_versions = defaultdict(int)
+
+    def record_request(self, host: str, requests: int = 1, new_connections: int = 0) -> None:
+        """Add request and connection counts for a host"""
+        with self._lock:
+            self._hosts[host]['requests'] += requests
+            self._hosts[host]['new_connections'] += new_connections
+
+    def record_connection(self, host: str) -> None:
+        """Count a new TCP connection to a host"""
+        self.record_request(host, requests=0, new_connections=1)
+
+    def record_http_version(self, version: str) -> None:
+        """Count the protocol version a response was served with"""
+        with self._lock:
+            self._http_versions[version] += 1
+
+    def totals(self) -> Dict[str, int]:
+        """Return total request and connection counts across all hosts"""
+        with self._lock:
+            return {
+                'requests': sum(host['requests'] for host in self._hosts.values()),
+                'new_connections': sum(host['new_connections'] for host in self._hosts.values())
+            }
+
+    def snapshot(self) -> Dict:
+        """Return connection reuse statistics overall and per host"""
+        with self._lock:
+            hosts = {}
+            for host, counts in self._hosts.items():
+                reused = max(counts['requests'] - counts['new_connections'], 0)
+                hosts[host] = {
+                    **counts,
+                    'reused_connections': reused,
+                    'reuse_ratio': round(reused / counts['requests'], 3) if counts['requests'] else 0.0
+                }
+            requests = sum(host['requests'] for host in hosts.values())
+            reused = sum(host['reused_connections'] for host in hosts.values())
+            return {
+                'http2_enabled': settings.HTTP_HTTP2 and HTTP2_AVAILABLE,
+                'requests': requests,
+                'new_connections': sum(host['new_connections'] for host in hosts.values()),
+                'reused_connections': reused,
+                'reuse_ratio': round(reused / requests, 3) if requests else 0.0,
+                'http_versions': dict(self._http_versions),
+                'hosts': hosts
+            }
+
+
+stats = ConnectionStats()
+
+_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_client_lock = threading.Lock()
+_host_limits = defaultdict(lambda: threading.BoundedSemaphore(settings.HTTP_MAX_CONNECTIONS_PER_HOST))
+
+
+def _client_options() -> Dict:
+    """Options shared by the sync and async clients"""
+    return {
+        'headers': DEFAULT_HEADERS,
+        'timeout': httpx.Timeout(settings.HTTP_TIMEOUT),
+        'limits': httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        ),
+        'http2': settings.HTTP_HTTP2 and HTTP2_AVAILABLE,
+        'follow_redirects': True
+    }
+
+
+def _trace_request(request: httpx.Request) -> None:
+    """Attach a trace callback that counts connections opened for this request"""
+    host = request.url.host
+
+    def trace(event_name: str, info: Dict) -> None:
+        if event_name == 'connection.connect_tcp.complete':
+            stats.record_connection(host)
+
+    request.extensions['trace'] = trace
+    stats.record_request(host)
+
+
+def _record_response(response: httpx.Response) -> None:
+    stats.record_http_version(response.http_version)
+
+
+async def _atrace_request(request: httpx.Request) -> None:
+    """Async variant of _trace_request for the async client"""
+    host = request.url.host
+
+    async def trace(event_name: str, info: Dict) -> None:
+        if event_name == 'connection.connect_tcp.complete':
+            stats.record_connection(host)
+
+    request.extensions['trace'] = trace
+    stats.record_request(host)
+
+
+async def _arecord_response(response: httpx.Response) -> None:
+    stats.record_http_version(response.http_version)
+
+
+def get_http_client() -> httpx.Client:
+    """Return the process-wide pooled keep-alive client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                event_hooks={'request': [_trace_request], 'response': [_record_response]},
+                **_client_options()
+            )
+        return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the pooled async client, bound to the loop used by run_async"""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            event_hooks={'request': [_atrace_request], 'response': [_arecord_response]},
+            **_client_options()
+        )
+    return _async_client
+
+
+def run_async(coro):
+    """Run a coroutine on a persistent event loop so async connections survive between calls"""
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+    return _event_loop.run_until_complete(coro)
+
+
+def get(url: str, **kwargs) -> httpx.Response:
+    """GET a URL through the shared client, limiting concurrent requests per host"""
+    with _host_limits[urlparse(url).netloc]:
+        return get_http_client().get(url, **kwargs)
+
+
+def download(url: str, max_bytes: Optional[int] = None, content_types: Tuple[str, ...] = HTML_CONTENT_TYPES) -> Tuple[bytes, str]:
+    """Stream the body of a URL, returning it with its Content-Type header
+
+    The download stops as soon as the content type is not one of content_types or the body grows past
+    max_bytes, so PDFs, videos and oversized pages never occupy more than one chunk of memory.
+    """
+    max_bytes = max_bytes or settings.HTTP_MAX_PAGE_BYTES
+    with _host_limits[urlparse(url).netloc]:
+        with get_http_client().stream('GET', url) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            media_type = content_type.split(';', 1)[0].strip().lower()
+            if media_type and content_types and media_type not in content_types:
+                raise ResponseRejected(f"Unsupported content type {media_type} for {url}")
+            declared_length = response.headers.get('Content-Length', '')
+            if declared_length.isdigit() and int(declared_length) > max_bytes:
+                raise ResponseRejected(f"Body of {declared_length} bytes exceeds {max_bytes} for {url}")
+
+            chunks = []
+            size = 0
+            for chunk in response.iter_bytes():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ResponseRejected(f"Body exceeds {max_bytes} bytes for {url}")
+                chunks.append(chunk)
+            return b''.join(chunks), content_type
+
+
+def close() -> None:
+    """Close the shared clients"""
+    global _client, _async_client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+    if _async_client is not None and _event_loop is not None and not _event_loop.is_closed():
+        _event_loop.run_until_complete(_async_client.aclose())
+    _async_client = None
@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Sequence
+import numpy as np
+from scipy import sparse
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS_DIR = Path(__file__).parent / 'data' / 'stopwords'
+
+# Word characters plus the Indic blocks (Devanagari to Malayalam), whose vowel signs are not matched by \w,
+# without the danda and double danda that end sentences in all of these scripts
+TOKEN_PATTERN = re.compile(r'[\w\u0900-\u0963\u0966-\u0DFF\u200c\u200d]+')
+
+def load_stopwords(language: str) -> FrozenSet[str]:
+    """Read the stopword list of a language code, empty when none is shipped"""
+    path = STOPWORDS_DIR / f"{language}.txt"
+    if not path.exists():
+        return frozenset()
+    with open(path, encoding='utf-8') as f:
+        return frozenset(line.strip() for line in f if line.strip())
+
+class LanguageStats:
+    """Vocabulary and document frequencies of one language, grown as batches arrive"""
+
+    def __init__(self, language: str, max_terms: int):
+        self.language = language
+        self.max_terms = max_terms
+        self.stopwords = load_stopwords(language)
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.df = np.zeros(1024, dtype=np.int64)
+        self.documents = 0
+
+    def tokenize(self, text: str) -> List[str]:
+        """Lowercase word tokens without stopwords, numbers or very short Latin words"""
+        return [
+            token for token in TOKEN_PATTERN.findall(text.lower())
+            if not token.isdigit()
+            and (len(token) > 2 or (len(token) == 2 and not token.isascii()))
+            and token not in self.stopwords
+        ]
+
+    def _index(self, term: str) -> int:
+        index = self.vocabulary.get(term)
+        if index is None:
+            index = len(self.terms)
+            self.vocabulary[term] = index
+            self.terms.append(term)
+            if index >= len(self.df):
+                self.df = np.concatenate([self.df, np.zeros(len(self.df), dtype=np.int64)])
+        return index
+
+    def count_matrix(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        """Build the sparse documents x terms count matrix of a batch"""
+        indices = []
+        indptr = [0]
+        for text in texts:
+            indices.extend(self._index(token) for token in self.tokenize(text))
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr)),
+            shape=(len(texts), len(self.terms))
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+    def add_documents(self, counts: sparse.csr_matrix) -> None:
+        """Fold a batch into the document frequencies"""
+        # After sum_duplicates every (document, term) pair appears once
+        self.df[:counts.shape[1]] += np.bincount(counts.indices, minlength=counts.shape[1])
+        self.documents += counts.shape[0]
+
+    def weigh(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Apply sublinear term frequency and smoothed inverse document frequency"""
+        df = self.df[:counts.shape[1]]
+        idf = np.log((1 + self.documents) / (1 + df)) + 1
+        weights = counts.copy()
+        weights.data = (1 + np.log(weights.data)) * idf[weights.indices]
+        return weights
+
+    def top_terms(self, weights: sparse.csr_matrix, row: int, limit: int) -> List[str]:
+        """Highest weighted terms of a document; ties go to the term seen first"""
+        start, end = weights.indptr[row], weights.indptr[row + 1]
+        columns = weights.indices[start:end]
+        order = np.lexsort((columns, -weights.data[start:end]))[:limit]
+        return [self.terms[column] for column in columns[order]]
+
+    def prune(self) -> None:
+        """Keep the most frequent half of the vocabulary once it outgrows max_terms"""
+        if len(self.terms) <= self.max_terms:
+            return
+        keep = np.sort(np.argsort(-self.df[:len(self.terms)], kind='stable')[:self.max_terms // 2])
+        self.terms = [self.terms[index] for index in keep]
+        self.vocabulary = {term: index for index, term in enumerate(self.terms)}
+        self.df = self.df[keep].copy()
+        logger.info(f"Pruned {self.language} keyword vocabulary to {len(self.terms)} terms")
+
+    def to_dict(self) -> Dict:
+        return {'documents': self.documents, 'terms': self.terms, 'df': self.df[:len(self.terms)].tolist()}
+
+    def load_dict(self, data: Dict) -> None:
+        self.documents = data['documents']
+        self.terms = list(data['terms'])
+        self.vocabulary = {term: index for index, term in enumerate(self.terms)}
+        self.df = np.zeros(max(len(self.terms), 1024), dtype=np.int64)
+        self.df[:len(self.terms)] = data['df']
+
+class KeywordEngine:
+    """Ranks the keywords of a whole batch of articles with TF-IDF over per-language statistics"""
+
+    def __init__(self, stats_file: Optional[str] = None, max_terms: Optional[int] = None):
+        self.stats_file = settings.KEYWORD_STATS_FILE if stats_file is None else stats_file
+        self.max_terms = max_terms or settings.KEYWORD_MAX_TERMS
+        self._languages: Dict[str, LanguageStats] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _stats(self, language: str) -> LanguageStats:
+        if language not in self._languages:
+            self._languages[language] = LanguageStats(language, self.max_terms)
+        return self._languages[language]
+
+    def extract_many(
+        self,
+        texts: Sequence[str],
+        languages: Sequence[Optional[str]],
+        limit: Optional[int] = None,
+        update_stats: bool = True
+    ) -> List[List[str]]:
+        """Return ranked keywords for each text; the batch is counted into the statistics first unless update_stats is off"""
+        limit = limit or settings.KEYWORDS_PER_ARTICLE
+        groups = defaultdict(list)
+        for position, language in enumerate(languages):
+            groups[language or 'en'].append(position)
+
+        results: List[List[str]] = [[] for _ in texts]
+        with self._lock:
+            for language, positions in groups.items():
+                stats = self._stats(language)
+                counts = stats.count_matrix([texts[position] or '' for position in positions])
+                if update_stats:
+                    stats.add_documents(counts)
+                weights = stats.weigh(counts)
+                for row, position in enumerate(positions):
+                    results[position] = stats.top_terms(weights, row, limit)
+                stats.prune()
+        return results
+
+    def _load(self) -> None:
+        if not self.stats_file or not os.path.exists(self.stats_file):
+            return
+        try:
+            with open(self.stats_file, encoding='utf-8') as f:
+                data = json.load(f)
+            for language, language_data in data.items():
+                self._stats(language).load_dict(language_data)
+            logger.info(f"Loaded keyword statistics for {len(data)} languages from {self.stats_file}")
+        except Exception as e:
+            logger.error(f"Failed to load keyword statistics from {self.stats_file}: {str(e)}")
+
+    def save(self) -> None:
+        """Persist the document frequencies so ranking does not restart cold"""
+        if not self.stats_file:
+            return
+        with self._lock:
+            data = {language: stats.to_dict() for language, stats in self._languages.items()}
+        tmp_path = f"{self.stats_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.stats_file)
@@ -0,0 +1,142 @@
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+from langdetect import DetectorFactory, detect
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# langdetect is randomised unless seeded
+DetectorFactory.seed = 0
+
+LATIN = 'latin'
+
+# Indic and Arabic scripts by 128-codepoint Unicode block (code point >> 7)
+BLOCK_SCRIPTS = {
+    0x600 >> 7: 'arabic',
+    0x680 >> 7: 'arabic',
+    0x900 >> 7: 'devanagari',
+    0x980 >> 7: 'bengali',
+    0xA00 >> 7: 'gurmukhi',
+    0xA80 >> 7: 'gujarati',
+    0xB00 >> 7: 'oriya',
+    0xB80 >> 7: 'tamil',
+    0xC00 >> 7: 'telugu',
+    0xC80 >> 7: 'kannada',
+    0xD00 >> 7: 'malayalam',
+}
+
+# Script each language is written in; languages not listed are assumed to use Latin
+LANGUAGE_SCRIPTS = {
+    'hi': 'devanagari', 'mr': 'devanagari', 'ne': 'devanagari', 'sa': 'devanagari',
+    'bn': 'bengali', 'as': 'bengali',
+    'pa': 'gurmukhi',
+    'gu': 'gujarati',
+    'or': 'oriya',
+    'ta': 'tamil',
+    'te': 'telugu',
+    'kn': 'kannada',
+    'ml': 'malayalam',
+    'ur': 'arabic', 'ar': 'arabic', 'fa': 'arabic',
+}
+
+# Scripts that identify a single language without a statistical pass
+SCRIPT_LANGUAGES = {
+    'gurmukhi': 'pa',
+    'gujarati': 'gu',
+    'oriya': 'or',
+    'tamil': 'ta',
+    'telugu': 'te',
+    'kannada': 'kn',
+    'malayalam': 'ml',
+}
+
+TIERS = ('prior', 'script', 'statistical', 'default')
+
+def normalize_language(code: Optional[str]) -> Optional[str]:
+    """Reduce a language tag such as 'en-US' to its two-letter code"""
+    return code.strip().lower()[:2] if code and code.strip() else None
+
+def script_of(language: str) -> str:
+    return LANGUAGE_SCRIPTS.get(language, LATIN)
+
+def script_histogram(text: str, sample_chars: Optional[int] = None) -> Counter:
+    """Count letters per script over a bounded sample of the text"""
+    sample = text[:sample_chars or settings.LANGUAGE_SAMPLE_CHARS]
+    counts = Counter()
+    for char in sample:
+        codepoint = ord(char)
+        if codepoint < 0x250:
+            if char.isalpha():
+                counts[LATIN] += 1
+        else:
+            script = BLOCK_SCRIPTS.get(codepoint >> 7)
+            if script:
+                counts[script] += 1
+    return counts
+
+class LanguageDetector:
+    """Tiered language detection: known priors, then Unicode script, then langdetect when they disagree"""
+
+    def __init__(self, sample_chars: Optional[int] = None, script_threshold: Optional[float] = None):
+        self.sample_chars = sample_chars or settings.LANGUAGE_SAMPLE_CHARS
+        self.script_threshold = script_threshold or settings.LANGUAGE_SCRIPT_THRESHOLD
+
+    def detect(self, text: str, priors: Iterable[Optional[str]] = ()) -> Tuple[str, str]:
+        """Return (language, tier); priors are tried in order, e.g. the feed's language then the page's"""
+        priors = [language for language in map(normalize_language, priors) if language]
+        histogram = script_histogram(text, self.sample_chars)
+        letters = sum(histogram.values())
+        if not letters:
+            return (priors[0], 'prior') if priors else ('en', 'default')
+
+        script, count = histogram.most_common(1)[0]
+        if count / letters < self.script_threshold:
+            script = None
+
+        # A prior written in the text's dominant script needs no further checks
+        for language in priors:
+            if script_of(language) == script:
+                return language, 'prior'
+
+        if script in SCRIPT_LANGUAGES:
+            return SCRIPT_LANGUAGES[script], 'script'
+
+        # Latin, Devanagari, Bengali and Arabic are shared by several languages
+        try:
+            language = normalize_language(detect(text[:self.sample_chars]))
+            if script is None or script_of(language) == script:
+                return language, 'statistical'
+        except Exception as e:
+            logger.warning(f"Language detection failed: {str(e)}")
+        return (priors[0] if priors else 'en'), 'default'
+
+class DetectionStats:
+    """Counts which detection tier decided each article's language"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers = defaultdict(int)
+
+    def record(self, tier: str) -> None:
+        with self._lock:
+            self._tiers[tier] += 1
+
+    def snapshot(self) -> Dict:
+        """Return the count and hit rate of every tier"""
+        with self._lock:
+            total = sum(self._tiers.values())
+            return {
+                'detections': total,
+                'tiers': {
+                    tier: {
+                        'count': self._tiers[tier],
+                        'hit_rate': round(self._tiers[tier] / total, 3) if total else 0.0
+                    }
+                    for tier in TIERS
+                }
+            }
+
+
+stats = DetectionStats()
@@ -1,9 +1,12 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Response
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import List
 import logging
+from . import crud, http_client, language, nlp, resilience
+from .extractor_stats import get_strategy_stats
+from .config import settings
 from .database import get_db
-from .models import Feed
 from .rss.scheduler import RSSScheduler
 import threading
 from fastapi.middleware.cors import CORSMiddleware
@@ -18,67 +21,130 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Start the RSS scheduler in a background thread
 def start_scheduler_thread():
     scheduler = RSSScheduler()
-    scheduler.start()
+    scheduler.start(settings.FETCH_INTERVAL)
 
 @app.on_event("startup")
 async def startup_event():
     """Start the RSS scheduler when the application starts"""
+    # Refuse to start with missing NLTK data rather than failing on every article
+    nlp.verify_resources()
     thread = threading.Thread(target=start_scheduler_thread, daemon=True)
     thread.start()
     logger.info("RSS Feed scheduler started")
 
+@app.get("/metrics/http")
+def get_http_metrics():
+    """Get connection reuse statistics of the shared HTTP client"""
+    return http_client.stats.snapshot()
+
+@app.get("/metrics/breakers")
+def get_breaker_metrics():
+    """Get the per-domain circuit breaker states"""
+    return resilience.breakers.snapshot()
+
+@app.get("/metrics/extractors")
+def get_extractor_metrics():
+    """Get per-domain success rate and latency of each extraction strategy"""
+    return get_strategy_stats().snapshot()
+
+@app.get("/metrics/language")
+def get_language_metrics():
+    """Get how often each language detection tier decided an article's language"""
+    return language.stats.snapshot()
+
 @app.get("/feeds/", response_model=List[dict])
 def get_feeds(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str = None,
     skip: int = 0,
-    limit: int = 100,
     language: str = None,
     region: str = None,
     state: str = None,
+    cluster_id: int = None,
+    collapse_duplicates: bool = False,
+    fields: str = None,
     db: Session = Depends(get_db)
 ):
-    """Get RSS feeds with optional filtering"""
-    query = db.query(Feed)
-    
-    if language:
-        query = query.filter(Feed.language == language)
-    if region:
-        query = query.filter(Feed.region == region)
-    if state:
-        query = query.filter(Feed.state == state)
-        
-    feeds = query.offset(skip).limit(limit).all()
+    """Get RSS feeds, newest first, with optional filtering; collapse_duplicates keeps one article per near-duplicate cluster
+
+    The next page is fetched by passing the X-Next-Cursor response header back as cursor. fields is a
+    comma-separated list of columns to return instead of the summary columns; content comes from /feeds/{feed_id}.
+    """
+    try:
+        field_names = crud.parse_fields(fields)
+        feeds, next_cursor = crud.get_feeds(
+            db,
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            language=language,
+            region=region,
+            state=state,
+            cluster_id=cluster_id,
+            collapse_duplicates=collapse_duplicates,
+            fields=field_names
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
     
-    # Convert feeds to dictionaries and handle JSON fields
-    return [
-        {
-            "id": feed.id,
-            "title": feed.title,
-            "description": feed.description,
-            "link": feed.link,
-            "published_date": feed.published_date,
-            "source": feed.source,
-            "language": feed.language,
-            "region": feed.region,
-            "state": feed.state,
-            "content": feed.content,
-            "author": feed.author,
-            "image_urls": feed.image_urls or [],
-            "keywords": feed.keywords or [],
-            "summary": feed.summary,
-            "extraction_success": feed.extraction_success
-        }
-        for feed in feeds
-    ]
+    return [crud.serialize_feed(feed, field_names) for feed in feeds]
+
+@app.get("/feeds/search", response_model=List[dict])
+def search_feeds(
+    response: Response,
+    query: str,
+    source: str = None,
+    state: str = None,
+    language: str = None,
+    date_from: datetime = None,
+    date_to: datetime = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str = None,
+    fields: str = None,
+    db: Session = Depends(get_db)
+):
+    """Full-text search over title, summary and content, best match first, with highlighted snippets
+
+    The next page is fetched by passing the X-Next-Cursor response header back as cursor.
+    """
+    try:
+        results, next_cursor = crud.search_feeds(
+            db,
+            query,
+            limit=limit,
+            cursor=cursor,
+            fields=crud.parse_fields(fields),
+            source=source,
+            state=state,
+            language=language,
+            date_from=date_from,
+            date_to=date_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return results
 
 @app.get("/feeds/{feed_id}")
 def get_feed(feed_id: int, db: Session = Depends(get_db)):
-    """Get a specific feed by ID"""
-    feed = db.query(Feed).filter(Feed.id == feed_id).first()
+    """Get a specific feed by ID, including its full content"""
+    feed = crud.get_feed(db, feed_id)
     if feed is None:
         raise HTTPException(status_code=404, detail="Feed not found")
-    return feed 
\ No newline at end of file
+    return crud.serialize_feed(feed, crud.FEED_FIELDS)
+
+
+@app.get("/stats")
+def get_stats(db: Session = Depends(get_db)):
+    """Article counts in total and by language, region and state, read from the counters kept at ingest time"""
+    return crud.get_stats(db)
@@ -1,44 +1,116 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text, Boolean, JSON, Index, Computed, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from .database import Base
 
+# Text search configuration per article language; languages without a stemmer are indexed word for word
+SEARCH_CONFIGS = {'en': 'english'}
+DEFAULT_SEARCH_CONFIG = 'simple'
+# Characters of the content indexed for search, keeping vectors well below the 1 MB tsvector limit
+SEARCH_CONTENT_CHARS = 100000
+
+def search_config_sql(column: str = 'language') -> str:
+    cases = ' '.join(f"WHEN '{language}' THEN '{config}'::regconfig" for language, config in SEARCH_CONFIGS.items())
+    return f"CASE {column} {cases} ELSE '{DEFAULT_SEARCH_CONFIG}'::regconfig END"
+
+# Title outranks the summary, which outranks the body
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector({search_config_sql()}, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector({search_config_sql()}, coalesce(summary, '')), 'B') || "
+    f"setweight(to_tsvector({search_config_sql()}, left(coalesce(content, ''), {SEARCH_CONTENT_CHARS})), 'C')"
+)
+
 class Feed(Base):
     __tablename__ = "feeds"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # The table is range-partitioned by month of published_date, which therefore is part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     title = Column(String, index=True)
     description = Column(Text)
-    link = Column(String, unique=True, index=True)
-    published_date = Column(DateTime)
+    link = Column(String, index=True)
+    published_date = Column(DateTime, primary_key=True)
     source = Column(String, index=True)
     language = Column(String, index=True)
     region = Column(String, index=True)
     state = Column(String, index=True)
     
-    # New fields for article content
-    content = Column(Text, nullable=True)
-    content_html = Column(Text, nullable=True)
+    # New fields for article content, only loaded when accessed or undeferred as a group
+    content = deferred(Column(Text, nullable=True), group='content')
+    content_html = deferred(Column(Text, nullable=True), group='content')
     author = Column(String, nullable=True)
     image_urls = Column(JSON, nullable=True)
     keywords = Column(JSON, nullable=True)
+    # Named entities found in the content, and the topic extractor version that produced them
+    topics = Column(JSON, nullable=True)
+    topics_version = Column(Integer, nullable=True, index=True)
+    # SimHash of the text and the near-duplicate cluster it belongs to (the first member's fingerprint)
+    simhash = Column(BigInteger, nullable=True)
+    cluster_id = Column(BigInteger, nullable=True, index=True)
+    is_duplicate = Column(Boolean, nullable=False, default=False, server_default='false')
     summary = Column(Text, nullable=True)
     extracted_by = Column(String, nullable=True)
     extraction_time = Column(DateTime, nullable=True)
     extraction_success = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Full-text search document maintained by Postgres from the columns above
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
     
-    # Relationships
-    articles = relationship("Article", back_populates="feed")
+    # Relationships; partitioned tables cannot be referenced by foreign keys
+    articles = relationship("Article", back_populates="feed", primaryjoin="Feed.id == foreign(Article.feed_id)")
+
+    # Keyset pagination of GET /feeds/ walks (published_date, id), optionally within one filter value
+    __table_args__ = (
+        # Unique constraints of a partitioned table must include the partition key
+        UniqueConstraint('link', 'published_date', name='uq_feeds_link_published_date'),
+        Index('ix_feeds_published_date_id', 'published_date', 'id'),
+        Index('ix_feeds_language_published_date_id', 'language', 'published_date', 'id'),
+        Index('ix_feeds_region_published_date_id', 'region', 'published_date', 'id'),
+        Index('ix_feeds_state_published_date_id', 'state', 'published_date', 'id'),
+        Index('ix_feeds_search_vector', 'search_vector', postgresql_using='gin'),
+        {'postgresql_partition_by': 'RANGE (published_date)'},
+    )
 
 class Article(Base):
     __tablename__ = "articles"
 
     id = Column(Integer, primary_key=True, index=True)
-    feed_id = Column(Integer, ForeignKey("feeds.id"))
+    feed_id = Column(Integer, index=True)
     title = Column(String, index=True)
     link = Column(String, unique=True, index=True)
     description = Column(Text)
     published_date = Column(DateTime)
-    feed = relationship("Feed", back_populates="articles") 
\ No newline at end of file
+    feed = relationship("Feed", back_populates="articles", primaryjoin="Feed.id == foreign(Article.feed_id)")
+
+class FeedFetchState(Base):
+    __tablename__ = "feed_fetch_states"
+
+    # Key of the feed in feeds_config.json
+    feed_id = Column(String, primary_key=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    body_hash = Column(String(64), nullable=True)
+    last_status = Column(Integer, nullable=True)
+    last_checked_at = Column(DateTime(timezone=True), nullable=True)
+    last_changed_at = Column(DateTime(timezone=True), nullable=True)
+
+class FeedPartitionArchive(Base):
+    __tablename__ = "feed_partition_archives"
+
+    # Monthly partition of feeds, e.g. feeds_p2025_01
+    partition_name = Column(String, primary_key=True)
+    path = Column(String, nullable=False)
+    rows = Column(Integer, nullable=False)
+    bytes = Column(BigInteger, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set once the partition is detached or dropped from feeds
+    removed_at = Column(DateTime(timezone=True), nullable=True)
+
+class FeedStat(Base):
+    __tablename__ = "feed_stats"
+
+    # Stored articles per value of a dimension, kept current by the feed writer; see app.feed_stats
+    dimension = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    articles = Column(BigInteger, nullable=False, default=0, server_default='0')
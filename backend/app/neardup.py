@@ -0,0 +1,139 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from .config import settings
+from .keywords import TOKEN_PATTERN
+from .models import Feed
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+
+# Odd multipliers that mix the token hashes of a shingle before folding them together
+_SHINGLE_MULTIPLIERS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)
+
+def _token_hash(token: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finaliser, spreading shingle hashes over all 64 bits"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash of the word shingles of a text, or None when it is too short"""
+    tokens = TOKEN_PATTERN.findall((text or '').lower())
+    if len(tokens) < SHINGLE_SIZE:
+        return None
+
+    hashes = {token: _token_hash(token) for token in set(tokens)}
+    token_hashes = np.fromiter((hashes[token] for token in tokens), dtype=np.uint64, count=len(tokens))
+    with np.errstate(over='ignore'):
+        shingles = np.zeros(len(tokens) - SHINGLE_SIZE + 1, dtype=np.uint64)
+        for offset in range(SHINGLE_SIZE):
+            shingles ^= token_hashes[offset:len(tokens) - SHINGLE_SIZE + 1 + offset] * _SHINGLE_MULTIPLIERS[offset]
+        shingles = _mix(np.unique(shingles))
+
+    # Each bit of the fingerprint is the majority vote of that bit over all shingles
+    bits = np.unpackbits(shingles.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    votes = bits.sum(axis=0) * 2 > len(shingles)
+    return int(np.packbits(votes, bitorder='little').view('<u8')[0])
+
+def to_signed(fingerprint: Optional[int]) -> Optional[int]:
+    """Store unsigned 64-bit fingerprints in a signed BIGINT column"""
+    if fingerprint is None:
+        return None
+    return fingerprint - (1 << 64) if fingerprint >= (1 << 63) else fingerprint
+
+def to_unsigned(value: Optional[int]) -> Optional[int]:
+    if value is None:
+        return None
+    return value + (1 << 64) if value < 0 else value
+
+class NearDuplicateIndex:
+    """Banded LSH over SimHash fingerprints of the most recent articles, grouping near-duplicates into clusters
+
+    With more bands than the allowed Hamming distance, two fingerprints within that distance share at least
+    one identical band, so a lookup only compares against the few fingerprints in the article's band buckets.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, max_distance: Optional[int] = None, bands: Optional[int] = None):
+        self.max_size = max_size or settings.NEARDUP_INDEX_SIZE
+        self.max_distance = settings.NEARDUP_MAX_DISTANCE if max_distance is None else max_distance
+        # One band more than the distance is enough; more bands only make the buckets larger
+        self.bands = bands or self.max_distance + 1
+        if self.bands <= self.max_distance:
+            raise ValueError("Need more bands than the maximum Hamming distance")
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        self._band_mask = (1 << self.band_bits) - 1
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(self.bands)]
+        # fingerprint -> cluster id, oldest first
+        self._clusters: OrderedDict = OrderedDict()
+        self.warmed = False
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        return [(fingerprint >> (band * self.band_bits)) & self._band_mask for band in range(self.bands)]
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """Return the cluster of the closest indexed fingerprint within max_distance"""
+        best = None
+        best_distance = self.max_distance + 1
+        for band, value in enumerate(self._band_values(fingerprint)):
+            for candidate in self._buckets[band].get(value, ()):
+                distance = (candidate ^ fingerprint).bit_count()
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+        return self._clusters[best] if best is not None else None
+
+    def add(self, fingerprint: int, cluster_id: int) -> None:
+        """Index a fingerprint, evicting the oldest one when full"""
+        if fingerprint in self._clusters:
+            self._clusters.move_to_end(fingerprint)
+            return
+        self._clusters[fingerprint] = cluster_id
+        for band, value in enumerate(self._band_values(fingerprint)):
+            self._buckets[band].setdefault(value, set()).add(fingerprint)
+        if len(self._clusters) > self.max_size:
+            self._remove(self._clusters.popitem(last=False)[0])
+
+    def _remove(self, fingerprint: int) -> None:
+        for band, value in enumerate(self._band_values(fingerprint)):
+            bucket = self._buckets[band].get(value)
+            if bucket is not None:
+                bucket.discard(fingerprint)
+                if not bucket:
+                    del self._buckets[band][value]
+
+    def assign(self, fingerprint: int) -> Tuple[int, bool]:
+        """Return (cluster id, is_duplicate) for a new article; a fingerprint without neighbours starts a cluster"""
+        cluster_id = self.find(fingerprint)
+        is_duplicate = cluster_id is not None
+        if cluster_id is None:
+            cluster_id = fingerprint
+        self.add(fingerprint, cluster_id)
+        return cluster_id, is_duplicate
+
+    def warm(self, db: Session) -> None:
+        """Load the fingerprints of the most recently stored articles"""
+        rows = (
+            db.query(Feed.simhash, Feed.cluster_id)
+            .filter(Feed.simhash.isnot(None))
+            .order_by(Feed.id.desc())
+            .limit(self.max_size)
+            .all()
+        )
+        for fingerprint, cluster_id in reversed(rows):
+            self.add(to_unsigned(fingerprint), to_unsigned(cluster_id))
+        self.warmed = True
+        logger.info(f"Warmed near-duplicate index with {len(self)} fingerprints")
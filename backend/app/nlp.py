@@ -0,0 +1,116 @@
+"""
+Process-wide NLTK runtime: resources are verified and loaded once, then shared by every caller
+
+Install the required data once per machine:
+    python -m app.nlp --download
+"""
+import argparse
+import logging
+from typing import Dict, List, Optional, Sequence
+import nltk
+from nltk.tag.perceptron import PerceptronTagger
+from nltk.tokenize import NLTKWordTokenizer
+
+logger = logging.getLogger(__name__)
+
+# nltk.data path -> downloader package name
+REQUIRED_RESOURCES = {
+    'tokenizers/punkt': 'punkt',
+    'taggers/averaged_perceptron_tagger': 'averaged_perceptron_tagger',
+    'chunkers/maxent_ne_chunker': 'maxent_ne_chunker',
+    'corpora/words': 'words',
+}
+
+# Multiclass named entity chunker inside the maxent_ne_chunker package, the one nltk.ne_chunk uses
+NE_CHUNKER_PATH = 'chunkers/maxent_ne_chunker/english_ace_multiclass.pickle'
+
+# Named entity labels reported as topics
+TOPIC_ENTITY_LABELS = ('GPE', 'ORGANIZATION', 'PERSON')
+
+# Stored with each article's topics; bump it whenever topic extraction changes so old rows are recomputed
+TOPICS_VERSION = 1
+
+class NLPResourceError(RuntimeError):
+    """Raised when required NLTK data is not installed"""
+
+def missing_resources() -> List[str]:
+    """Return the downloader names of required resources that cannot be found"""
+    missing = []
+    for path, package in REQUIRED_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(package)
+    return missing
+
+def verify_resources() -> None:
+    """Fail fast when NLTK data is missing instead of downloading it in the middle of a crawl"""
+    missing = missing_resources()
+    if missing:
+        raise NLPResourceError(
+            f"Missing NLTK resources: {', '.join(missing)}. "
+            f"Install them with: python -m app.nlp --download"
+        )
+
+class NLPRuntime:
+    """Tokenizer, tagger and named entity chunker loaded once per process"""
+
+    def __init__(self):
+        verify_resources()
+        self._sentence_tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
+        self._word_tokenizer = NLTKWordTokenizer()
+        self._tagger = PerceptronTagger()
+        self._chunker = nltk.data.load(NE_CHUNKER_PATH)
+        logger.info("Loaded NLP runtime")
+
+    def sentences(self, text: str) -> List[str]:
+        return self._sentence_tokenizer.tokenize(text)
+
+    def tokenize(self, text: str) -> List[str]:
+        """Split text into word tokens, sentence by sentence like nltk.word_tokenize"""
+        return [token for sentence in self.sentences(text) for token in self._word_tokenizer.tokenize(sentence)]
+
+    def entities_many(self, texts: Sequence[str], labels: Sequence[str] = TOPIC_ENTITY_LABELS) -> List[List[str]]:
+        """Return the distinct named entities of each text, chunking every sentence of the batch together"""
+        owners = []
+        token_sentences = []
+        for index, text in enumerate(texts):
+            for sentence in self.sentences(text):
+                owners.append(index)
+                token_sentences.append(self._word_tokenizer.tokenize(sentence))
+
+        tagged = self._tagger.tag_sents(token_sentences)
+        results: List[Dict[str, None]] = [{} for _ in texts]
+        for index, tree in zip(owners, self._chunker.parse_sents(tagged)):
+            for node in tree:
+                if hasattr(node, 'label') and node.label() in labels:
+                    # Dict keys keep the entities distinct and in order of appearance
+                    results[index][' '.join(leaf[0] for leaf in node.leaves())] = None
+        return [list(entities) for entities in results]
+
+
+_runtime: Optional[NLPRuntime] = None
+
+def get_runtime() -> NLPRuntime:
+    """Return the process-wide runtime, loading it on first use"""
+    global _runtime
+    if _runtime is None:
+        _runtime = NLPRuntime()
+    return _runtime
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check or install the NLTK data used by the NLP runtime")
+    parser.add_argument('--download', action='store_true', help="Download missing resources")
+    args = parser.parse_args()
+
+    missing = missing_resources()
+    if missing and args.download:
+        for package in missing:
+            nltk.download(package, quiet=True)
+        missing = missing_resources()
+    if missing:
+        raise SystemExit(f"Missing NLTK resources: {', '.join(missing)}")
+    print("All NLTK resources are installed")
+
+if __name__ == '__main__':
+    main()
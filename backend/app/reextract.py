@@ -0,0 +1,127 @@
+"""
+Re-run content extraction over cached article pages without network access
+
+Usage:
+    python -m app.reextract --from 2025-01-01 --to 2025-02-01 [--workers 8] [--batch-size 200]
+"""
+import argparse
+import logging
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy.orm import Session
+from .database import SessionLocal
+from .extraction_pool import ExtractionPool
+from .keywords import KeywordEngine
+from .models import Feed
+from .rss.writer import extracted_columns
+
+logger = logging.getLogger(__name__)
+
+def reextract(date_from: datetime, date_to: datetime, workers: Optional[int] = None, batch_size: int = 200) -> Dict[str, int]:
+    """Re-extract every stored article published in [date_from, date_to) from the HTML cache"""
+    stats = {'articles': 0, 'updated': 0, 'not_cached': 0, 'failed': 0}
+    db = SessionLocal()
+    pool = ExtractionPool(workers)
+    keyword_engine = KeywordEngine()
+    try:
+        pending = {}
+        updates = []
+        languages = []
+        # Keep a bounded number of jobs in flight so large ranges do not fill memory
+        max_in_flight = pool.max_workers * 4
+        rows = _iter_articles(db, date_from, date_to)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                row = next(rows, None)
+                if row is None:
+                    exhausted = True
+                    break
+                pending[pool.submit_reextract(row.link, row.language)] = row
+                stats['articles'] += 1
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                row = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Re-extraction of feed {row.id} failed: {str(e)}")
+                    stats['failed'] += 1
+                    continue
+                if result is None:
+                    stats['not_cached'] += 1
+                elif result.get('extraction_success'):
+                    # New content makes the stored topics stale until app.topics recomputes them
+                    updates.append({
+                        'id': row.id,
+                        'published_date': row.published_date,
+                        **extracted_columns(result),
+                        'topics_version': None
+                    })
+                    languages.append(row.language)
+                else:
+                    stats['failed'] += 1
+
+            if len(updates) >= batch_size:
+                stats['updated'] += _apply_updates(db, updates, languages, keyword_engine)
+                updates = []
+                languages = []
+
+        stats['updated'] += _apply_updates(db, updates, languages, keyword_engine)
+    finally:
+        pool.shutdown()
+        db.close()
+
+    logger.info(
+        f"Re-extracted {stats['articles']} articles: {stats['updated']} updated, "
+        f"{stats['not_cached']} not cached, {stats['failed']} failed"
+    )
+    return stats
+
+def _iter_articles(db: Session, date_from: datetime, date_to: datetime, chunk_size: int = 1000) -> Iterator:
+    """Yield (id, published_date, link, language) rows in id order, one keyset-paged query per chunk so commits can happen in between"""
+    last_id = 0
+    while True:
+        chunk = (
+            db.query(Feed.id, Feed.published_date, Feed.link, Feed.language)
+            .filter(Feed.published_date >= date_from, Feed.published_date < date_to, Feed.id > last_id)
+            .order_by(Feed.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not chunk:
+            return
+        yield from chunk
+        last_id = chunk[-1].id
+
+def _apply_updates(db: Session, updates: List[Dict], languages: List[Optional[str]], keyword_engine: KeywordEngine) -> int:
+    """Re-rank the keywords of a batch and write its re-extracted columns in one transaction"""
+    if not updates:
+        return 0
+    # These articles are already counted in the document frequencies
+    keywords = keyword_engine.extract_many([update['content'] for update in updates], languages, update_stats=False)
+    for update, update_keywords in zip(updates, keywords):
+        update['keywords'] = update_keywords
+    db.bulk_update_mappings(Feed, updates)
+    db.commit()
+    return len(updates)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-extract cached articles without refetching them")
+    parser.add_argument('--from', dest='date_from', required=True, type=datetime.fromisoformat,
+                        help="First publication date to include (ISO format)")
+    parser.add_argument('--to', dest='date_to', required=True, type=datetime.fromisoformat,
+                        help="Publication date to stop at, exclusive (ISO format)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: EXTRACTION_WORKERS)")
+    parser.add_argument('--batch-size', type=int, default=200, help="Rows updated per transaction")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(reextract(args.date_from, args.date_to, args.workers, args.batch_size))
+
+if __name__ == '__main__':
+    main()
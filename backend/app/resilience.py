@@ -0,0 +1,143 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class CircuitBreaker:
+    """Stops requests to a failing domain for a cooling-off period"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, domain: str, failure_threshold: int, cooldown: float):
+        self.domain = domain
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_started_at: Optional[float] = None
+        self.total_failures = 0
+        self.total_successes = 0
+        self.times_opened = 0
+
+    def allow(self, now: float) -> bool:
+        """Return whether a request may be sent; one trial request is let through after the cooldown"""
+        if self.state == self.HALF_OPEN and now - self.trial_started_at >= self.cooldown:
+            # A trial whose outcome never arrived counts as failed, so the domain is not blocked for good
+            logger.warning(f"Circuit breaker trial for {self.domain} timed out, reopening")
+            self.state = self.OPEN
+            self.opened_at = now
+            return False
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.cooldown:
+                return False
+            self.state = self.HALF_OPEN
+            self.trial_started_at = now
+            return True
+        # While half-open, further requests wait for the trial to finish
+        return self.state == self.CLOSED
+
+    def record_success(self) -> None:
+        self.total_successes += 1
+        self.consecutive_failures = 0
+        self.state = self.CLOSED
+        self.opened_at = None
+        self.trial_started_at = None
+
+    def record_failure(self, now: float) -> None:
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+                logger.warning(f"Circuit breaker opened for {self.domain} after {self.consecutive_failures} failures")
+            self.state = self.OPEN
+            self.opened_at = now
+            self.trial_started_at = None
+
+    def seconds_until_retry(self, now: float) -> float:
+        """Seconds left in the cooling-off period"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(self.cooldown - (now - self.opened_at), 0.0)
+
+    def snapshot(self, now: float) -> Dict:
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'total_failures': self.total_failures,
+            'total_successes': self.total_successes,
+            'times_opened': self.times_opened,
+            'retry_in_seconds': round(self.seconds_until_retry(now), 1)
+        }
+
+class CircuitBreakerRegistry:
+    """Per-domain circuit breakers shared by the fetcher and exposed through the API"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def _get(self, domain: str) -> CircuitBreaker:
+        if domain not in self._breakers:
+            self._breakers[domain] = CircuitBreaker(
+                domain, settings.BREAKER_FAILURE_THRESHOLD, settings.BREAKER_COOLDOWN
+            )
+        return self._breakers[domain]
+
+    def allow(self, domain: str) -> bool:
+        with self._lock:
+            return self._get(domain).allow(time.time())
+
+    def record_success(self, domain: str) -> None:
+        with self._lock:
+            self._get(domain).record_success()
+
+    def record_failure(self, domain: str) -> None:
+        with self._lock:
+            self._get(domain).record_failure(time.time())
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return the state of every known domain, open breakers first"""
+        now = time.time()
+        with self._lock:
+            breakers = sorted(self._breakers.values(), key=lambda b: (b.state == CircuitBreaker.CLOSED, b.domain))
+            return {breaker.domain: breaker.snapshot(now) for breaker in breakers}
+
+class RetryQueue:
+    """Delayed queue of work items waiting for their next attempt"""
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item: Any, delay: float) -> None:
+        """Schedule an item to become due after delay seconds"""
+        heapq.heappush(self._heap, (time.time() + delay, next(self._counter), item))
+
+    def pop_due(self) -> List[Any]:
+        """Remove and return every item whose delay has elapsed"""
+        now = time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Seconds until the next item is due, or None when empty"""
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - time.time(), 0.0)
+
+
+breakers = CircuitBreakerRegistry()
@@ -0,0 +1,199 @@
+"""
+Maintain the monthly partitions of the feeds table and move old article text into archive files
+
+Usage:
+    python -m app.retention [--dry-run] [--compact] [--archive-after-days 365] [--remove-after-days 730] [--mode detach]
+
+Creates the partitions of the coming months, writes every row of a month older than RETENTION_ARCHIVE_AFTER_DAYS
+to a gzip JSON Lines file under ARCHIVE_DIR before clearing its content and content_html, and detaches or drops
+archived months older than RETENTION_REMOVE_AFTER_DAYS.
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from .config import settings
+from .database import SessionLocal, engine
+from .feed_stats import apply_counts, count_table
+from .models import Feed, FeedPartitionArchive
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r'^feeds_p(\d{4})_(\d{2})$')
+DEFAULT_PARTITION = 'feeds_default'
+REMOVE_MODES = ('detach', 'drop')
+
+# Every stored column; search_vector is generated from them
+STORED_COLUMNS = ', '.join(column.name for column in Feed.__table__.columns if column.name != 'search_vector')
+ARCHIVE_BATCH_SIZE = 500
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"feeds_p{month.year:04d}_{month.month:02d}"
+
+def list_partitions(db: Session) -> List[Tuple[str, date]]:
+    """Monthly partitions attached to feeds with the first day of their month, oldest first"""
+    names = db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = 'feeds'::regclass"
+    )).scalars()
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+def _create_partition(db: Session, name: str, start: date, end: date) -> None:
+    """Attach the partition of [start, end), moving rows of that range out of the default partition first"""
+    bounds = {'start': start, 'end': end}
+    in_range = "published_date >= :start AND published_date < :end"
+    # Postgres refuses a new partition while the default partition holds rows of its range
+    db.execute(text(
+        f"CREATE TEMPORARY TABLE partition_rows AS SELECT {STORED_COLUMNS} FROM {DEFAULT_PARTITION} WHERE {in_range}"
+    ), bounds)
+    db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+    db.execute(text(f"CREATE TABLE {name} PARTITION OF feeds FOR VALUES FROM ('{start}') TO ('{end}')"))
+    db.execute(text(f"INSERT INTO feeds ({STORED_COLUMNS}) SELECT {STORED_COLUMNS} FROM partition_rows"))
+    db.execute(text("DROP TABLE partition_rows"))
+
+def ensure_partitions(db: Session, months_ahead: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+    """Create the partitions of the current month and the next months_ahead months that do not exist yet"""
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = (today or datetime.utcnow().date()).replace(day=1)
+    existing = {name for name, _ in list_partitions(db)}
+    created = []
+    for offset in range(months_ahead + 1):
+        month = _add_months(current, offset)
+        name = partition_name(month)
+        if name not in existing:
+            _create_partition(db, name, month, _add_months(month, 1))
+            created.append(name)
+    if created:
+        db.commit()
+        logger.info(f"Created feed partitions {', '.join(created)}")
+    return created
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+def archive_partition(db: Session, name: str, archive_dir: str) -> FeedPartitionArchive:
+    """Write every row of a partition to a gzip JSON Lines file, then clear its content and content_html"""
+    path = Path(archive_dir) / 'feeds' / f"{name}.jsonl.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+
+    rows = 0
+    result = db.execute(
+        text(f"SELECT {STORED_COLUMNS} FROM {name} ORDER BY published_date, id").execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+    )
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        for row in result.mappings():
+            f.write(json.dumps(dict(row), default=_json_default, ensure_ascii=False))
+            f.write('\n')
+            rows += 1
+    # The file is complete before any text is cleared, so a failed run can simply be repeated
+    os.replace(tmp_path, path)
+
+    db.execute(text(
+        f"UPDATE {name} SET content = NULL, content_html = NULL "
+        "WHERE content IS NOT NULL OR content_html IS NOT NULL"
+    ))
+    record = db.merge(FeedPartitionArchive(partition_name=name, path=str(path), rows=rows, bytes=path.stat().st_size))
+    db.commit()
+    logger.info(f"Archived {rows} articles of {name} to {path}")
+    return record
+
+def remove_partition(db: Session, record: FeedPartitionArchive, mode: str) -> None:
+    """Detach an archived partition into a standalone table, or drop it"""
+    # Its articles leave the /stats counters in the same transaction
+    apply_counts(db, count_table(db, record.partition_name), sign=-1)
+    if mode == 'drop':
+        db.execute(text(f"DROP TABLE {record.partition_name}"))
+    else:
+        db.execute(text(f"ALTER TABLE feeds DETACH PARTITION {record.partition_name}"))
+    record.removed_at = func.now()
+    db.commit()
+    logger.info(f"Removed feed partition {record.partition_name} ({mode})")
+
+def vacuum(names: List[str], full: bool = False) -> None:
+    """Reclaim the space of cleared article text; VACUUM FULL rewrites the partition and returns it to the OS"""
+    options = '(FULL, ANALYZE)' if full else '(ANALYZE)'
+    # VACUUM cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        for name in names:
+            connection.execute(text(f"VACUUM {options} {name}"))
+
+def run_retention(archive_after_days: Optional[int] = None, remove_after_days: Optional[int] = None,
+                  mode: Optional[str] = None, dry_run: bool = False, compact: bool = False,
+                  today: Optional[date] = None) -> Dict[str, List[str]]:
+    """Create upcoming partitions, archive old ones and remove archived ones; dry_run only reports what would change"""
+    archive_after_days = settings.RETENTION_ARCHIVE_AFTER_DAYS if archive_after_days is None else archive_after_days
+    remove_after_days = settings.RETENTION_REMOVE_AFTER_DAYS if remove_after_days is None else remove_after_days
+    mode = mode or settings.RETENTION_REMOVE_MODE
+    if mode not in REMOVE_MODES:
+        raise ValueError(f"Unknown partition remove mode {mode!r}, expected one of {', '.join(REMOVE_MODES)}")
+    today = today or datetime.utcnow().date()
+
+    stats = {'created': [], 'archived': [], 'removed': []}
+    db = SessionLocal()
+    try:
+        if not dry_run:
+            stats['created'] = ensure_partitions(db, today=today)
+        archives = {record.partition_name: record for record in db.query(FeedPartitionArchive)}
+        for name, month in list_partitions(db):
+            # Age of a partition counts from the end of its month
+            age = (today - _add_months(month, 1)).days
+            record = archives.get(name)
+            if record is None and archive_after_days and age >= archive_after_days:
+                stats['archived'].append(name)
+                if not dry_run:
+                    record = archive_partition(db, name, settings.ARCHIVE_DIR)
+            # Only partitions whose rows are safely in an archive file leave the table
+            archived = record is not None or name in stats['archived']
+            if archived and remove_after_days and age >= remove_after_days:
+                stats['removed'].append(name)
+                if not dry_run:
+                    remove_partition(db, record, mode)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    vacuumed = [name for name in stats['archived'] if name not in stats['removed']]
+    if vacuumed and not dry_run:
+        vacuum(vacuumed, full=compact)
+    return stats
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive and remove old monthly partitions of the feeds table")
+    parser.add_argument('--dry-run', action='store_true', help="Only list the partitions that would change")
+    parser.add_argument('--compact', action='store_true',
+                        help="VACUUM FULL archived partitions to return their space to the OS (locks each partition)")
+    parser.add_argument('--archive-after-days', type=int, default=None,
+                        help="Archive months older than this (default: RETENTION_ARCHIVE_AFTER_DAYS)")
+    parser.add_argument('--remove-after-days', type=int, default=None,
+                        help="Remove archived months older than this (default: RETENTION_REMOVE_AFTER_DAYS)")
+    parser.add_argument('--mode', choices=REMOVE_MODES, default=None,
+                        help="Detach or drop removed partitions (default: RETENTION_REMOVE_MODE)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(run_retention(args.archive_after_days, args.remove_after_days, args.mode, args.dry_run, args.compact))
+
+if __name__ == '__main__':
+    main()
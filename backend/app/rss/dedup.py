@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+import logging
+from sqlalchemy.orm import Session
+from ..models import Feed
+from ..urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+class SeenLinks:
+    """Memory-bounded LRU set of the canonical links of stored articles"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._links = OrderedDict()
+        self.warmed = False
+
+    def __contains__(self, link: str) -> bool:
+        if link in self._links:
+            self._links.move_to_end(link)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    def add(self, link: str) -> None:
+        """Remember a link by its canonical form, evicting the least recently seen one when full"""
+        link = canonicalize_url(link)
+        self._links[link] = None
+        self._links.move_to_end(link)
+        if len(self._links) > self.max_size:
+            self._links.popitem(last=False)
+
+    def update(self, links: Iterable[str]) -> None:
+        """Remember several links"""
+        for link in links:
+            self.add(link)
+
+    def warm(self, db: Session) -> None:
+        """Load the most recently stored links from the database"""
+        rows = db.query(Feed.link).order_by(Feed.id.desc()).limit(self.max_size).all()
+        # Insert oldest first so the newest links are the last to be evicted
+        self.update(link for (link,) in reversed(rows) if link)
+        self.warmed = True
+        logger.info(f"Warmed seen-link cache with {len(self)} links")
+
+class ExtractionMemo:
+    """Memory-bounded LRU of successful extraction results keyed by canonical URL"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._results = OrderedDict()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, url: str) -> Optional[Dict]:
+        result = self._results.get(url)
+        if result is not None:
+            self._results.move_to_end(url)
+            self.hits += 1
+        return result
+
+    def put(self, urls: Iterable[Optional[str]], result: Dict) -> None:
+        """Remember a result under each of its canonical URLs, evicting the least recently used when full"""
+        if not self.max_size:
+            return
+        for url in urls:
+            if url:
+                self._results[url] = result
+                self._results.move_to_end(url)
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
@@ -1,20 +1,47 @@
 import feedparser
+import asyncio
+import hashlib
+import httpx
+from collections import defaultdict, deque
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 import json
 import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from urllib.parse import urlparse
 from dateutil import parser as date_parser
-from ..content_extractor import ContentExtractor
+from ..config import settings
+from .. import http_client, language, resilience
+from ..domain_registry import get_domain_registry
+from ..extraction_pool import ExtractionPool
+from ..extractor_stats import get_strategy_stats
+from ..keywords import KeywordEngine
+from ..neardup import NearDuplicateIndex, simhash, to_signed
+from ..nlp import TOPICS_VERSION
+from ..urls import canonicalize_url
+from ..resilience import RetryQueue
+from ..retention import ensure_partitions
+from .dedup import ExtractionMemo, SeenLinks
+from .writer import FeedWriter, extracted_columns
 from ..database import SessionLocal
-from ..models import Feed, Article
+from ..models import Feed, Article, FeedFetchState
 from sqlalchemy.orm import Session
-from sqlalchemy import exists
 
 logger = logging.getLogger(__name__)
 
 class RSSFetcher:
     def __init__(self):
-        self.content_extractor = ContentExtractor()
+        self.extraction_pool = ExtractionPool()
+        self.seen_links = SeenLinks(settings.SEEN_LINKS_CACHE_SIZE)
+        self.extraction_memo = ExtractionMemo(settings.EXTRACTION_MEMO_SIZE)
+        self.neardup_index = NearDuplicateIndex()
+        self.strategy_stats = get_strategy_stats()
+        self.domains = get_domain_registry()
+        self.keyword_engine = KeywordEngine()
+        # Article downloads in flight and waiting per domain; workers each hold one, so the cap is kept here
+        self.domain_active: Dict[str, int] = defaultdict(int)
+        self.domain_waiting: Dict[str, deque] = defaultdict(deque)
         
     def parse_date(self, date_str: str) -> Optional[datetime]:
         """Parse date string to datetime object"""
@@ -26,66 +53,479 @@ class RSSFetcher:
             logger.error(f"Error parsing date {date_str}: {str(e)}")
             return None
 
-    def fetch_and_store_feeds(self, feeds_config: Dict) -> None:
-        """Fetch RSS feeds and store in database"""
+    def fetch_and_store_feeds(self, feeds_config: Dict) -> Dict:
+        """Fetch RSS feeds and store in database, returning counters for the cycle"""
+        stats = {
+            'feeds_total': len(feeds_config),
+            'feeds_processed': 0,
+            'feeds_not_modified': 0,
+            'feeds_unchanged': 0,
+            'feeds_failed': 0,
+            'articles_inserted': 0,
+            'articles_updated': 0,
+            'articles_skipped': 0,
+            'extraction_retries': 0,
+            'extractions_deferred': 0,
+            'extractions_memoized': 0,
+            'near_duplicates': 0,
+            'new_entries': {feed_id: 0 for feed_id in feeds_config}
+        }
+
         db = SessionLocal()
         try:
+            try:
+                ensure_partitions(db)
+            except Exception as e:
+                # Articles of a missing month still land in the default partition
+                db.rollback()
+                logger.error(f"Failed to create feed partitions: {str(e)}")
+            if not self.seen_links.warmed:
+                self.seen_links.warm(db)
+            if not self.neardup_index.warmed:
+                self.neardup_index.warm(db)
+            fetch_states = self._load_fetch_states(db, feeds_config)
+            writer = FeedWriter(db)
+            jobs = []
+            # Validators of changed feeds, only saved once all of their entries are stored
+            changed_validators = {}
+
+            downloads = {}
+            if settings.ASYNC_FETCH:
+                start_time = time.time()
+                downloads = http_client.run_async(self._download_feeds(feeds_config, fetch_states))
+                logger.info(f"Downloaded {len(feeds_config)} feeds in {time.time() - start_time:.2f}s")
+
             for feed_id, config in feeds_config.items():
-                self._process_feed(db, feed_id, config)
+                if settings.ASYNC_FETCH:
+                    download = downloads.get(feed_id)
+                else:
+                    download = http_client.run_async(self._download_feeds({feed_id: config}, fetch_states))[feed_id]
+                self._handle_download(db, feed_id, config, download, fetch_states[feed_id], stats, jobs, changed_validators)
+
+            incomplete_feeds = set()
+            write_ok = self._run_extractions(self._dedupe_jobs(jobs), writer, incomplete_feeds, stats)
+
+            for feed_id, validators in changed_validators.items():
+                if write_ok and feed_id not in incomplete_feeds:
+                    stats['feeds_processed'] += 1
+                    for key, value in validators.items():
+                        setattr(fetch_states[feed_id], key, value)
+                else:
+                    # Keep the old validators so the feed is processed in full next cycle
+                    stats['feeds_failed'] += 1
+            self._save_fetch_states(db, fetch_states)
+
+            stats['articles_inserted'] = writer.stats['inserted']
+            stats['articles_updated'] = writer.stats['updated']
+            stats['articles_skipped'] = writer.stats['skipped']
         finally:
             db.close()
 
-    def _process_feed(self, db: Session, feed_id: str, config: Dict) -> None:
-        """Process a single RSS feed"""
         try:
-            feed_data = feedparser.parse(config['url'])
-            
-            for entry in feed_data.entries:
-                if not self._entry_exists(db, entry.link):
-                    try:
-                        # Extract full content from the article URL
-                        content_data = self.content_extractor.extract_content(entry.link)
-                        
-                        # Create feed entry
-                        feed = Feed(
-                            title=entry.get('title', ''),
-                            description=entry.get('description', ''),
-                            link=entry.get('link', ''),
-                            published_date=self.parse_date(entry.get('published', '')),
-                            source=feed_id,
-                            language=config.get('language'),
-                            region=config.get('region'),
-                            state=config.get('state')
-                        )
-
-                        # Add content extraction data if available
-                        if content_data and content_data.get('extraction_success'):
-                            feed.content = content_data.get('text', '')
-                            feed.content_html = content_data.get('html', '')
-                            feed.author = content_data.get('author', '')
-                            feed.image_urls = content_data.get('image_urls', [])
-                            feed.keywords = content_data.get('keywords', [])
-                            feed.summary = content_data.get('summary', '')
-                            feed.extracted_by = content_data.get('extracted_by', '')
-                            feed.extraction_time = (
-                                datetime.fromisoformat(content_data['extraction_time'].replace('Z', '+00:00'))
-                                if content_data.get('extraction_time')
-                                else datetime.utcnow()
-                            )
-                            feed.extraction_success = True
-                        
-                        db.add(feed)
-                        db.commit()
-                        logger.info(f"Stored new feed entry: {entry.get('title', 'Untitled')}")
-                    except Exception as e:
-                        logger.error(f"Error processing entry {entry.get('link', 'unknown')}: {str(e)}")
-                        db.rollback()
-                        continue
-                
+            self.keyword_engine.save()
+        except Exception as e:
+            logger.error(f"Error saving keyword statistics: {str(e)}")
+        try:
+            self.strategy_stats.save()
+        except Exception as e:
+            logger.error(f"Error saving extractor statistics: {str(e)}")
+
+        logger.info(
+            f"Feed cycle: {stats['articles_inserted']} articles inserted, "
+            f"{stats['articles_updated']} updated, {stats['articles_skipped']} skipped, "
+            f"{stats['extraction_retries']} extraction retries, {stats['extractions_deferred']} deferred, "
+            f"{stats['extractions_memoized']} memoized, {stats['near_duplicates']} near-duplicates; "
+            f"{stats['feeds_processed']} feeds processed, "
+            f"{stats['feeds_not_modified']} not modified, "
+            f"{stats['feeds_unchanged']} unchanged, "
+            f"{stats['feeds_failed']} failed of {stats['feeds_total']}"
+        )
+        return stats
+
+    def _load_fetch_states(self, db: Session, feeds_config: Dict) -> Dict[str, FeedFetchState]:
+        """Load the stored validators of every configured feed in a single query"""
+        fetch_states = {
+            state.feed_id: state
+            for state in db.query(FeedFetchState).filter(FeedFetchState.feed_id.in_(list(feeds_config))).all()
+        }
+        for feed_id in feeds_config:
+            if feed_id not in fetch_states:
+                fetch_states[feed_id] = FeedFetchState(feed_id=feed_id)
+        return fetch_states
+
+    def _save_fetch_states(self, db: Session, fetch_states: Dict[str, FeedFetchState]) -> None:
+        """Persist the validators of every feed in the cycle"""
+        try:
+            for fetch_state in fetch_states.values():
+                db.merge(fetch_state)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error saving feed fetch states: {str(e)}")
+            db.rollback()
+
+    def _handle_download(
+        self,
+        db: Session,
+        feed_id: str,
+        config: Dict,
+        download: Optional[Dict],
+        fetch_state: FeedFetchState,
+        stats: Dict,
+        jobs: List[Dict],
+        changed_validators: Dict[str, Dict]
+    ) -> None:
+        """Skip unchanged feeds and queue the new entries of changed ones for extraction"""
+        if download is None:
+            stats['feeds_failed'] += 1
+            return
+
+        now = datetime.utcnow()
+        fetch_state.last_status = download['status']
+        fetch_state.last_checked_at = now
+        validators = {'etag': download['etag'], 'last_modified': download['last_modified']}
+
+        if download['status'] == 304:
+            # Servers often leave validators out of a 304; the stored ones still describe the cached body
+            validators = {
+                'etag': download['etag'] or fetch_state.etag,
+                'last_modified': download['last_modified'] or fetch_state.last_modified
+            }
+            stats['feeds_not_modified'] += 1
+            logger.debug(f"Feed {feed_id} not modified")
+        else:
+            body_hash = hashlib.sha256(download['content']).hexdigest()
+            if body_hash == fetch_state.body_hash:
+                stats['feeds_unchanged'] += 1
+                logger.debug(f"Feed {feed_id} body unchanged")
+            else:
+                feed_jobs = self._process_feed(db, feed_id, config, download['content'])
+                if feed_jobs is None:
+                    stats['feeds_failed'] += 1
+                    return
+                jobs.extend(feed_jobs)
+                stats['new_entries'][feed_id] = len(feed_jobs)
+                changed_validators[feed_id] = {**validators, 'body_hash': body_hash, 'last_changed_at': now}
+                return
+
+        for key, value in validators.items():
+            setattr(fetch_state, key, value)
+
+    async def _download_feeds(self, feeds_config: Dict, fetch_states: Dict[str, FeedFetchState]) -> Dict[str, Optional[Dict]]:
+        """Download all given feeds concurrently with global and per-host limits"""
+        global_limit = asyncio.Semaphore(settings.FETCH_CONCURRENCY)
+        host_limits = defaultdict(lambda: asyncio.Semaphore(settings.FETCH_PER_HOST_CONCURRENCY))
+        client = http_client.get_async_client()
+        results = await asyncio.gather(*[
+            self._download_feed(client, global_limit, host_limits, feed_id, config['url'], fetch_states.get(feed_id))
+            for feed_id, config in feeds_config.items()
+        ], return_exceptions=True)
+
+        # One feed with an unusable URL must not abort the downloads of the others
+        downloads = {}
+        for feed_id, result in zip(feeds_config, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error downloading feed {feed_id}: {str(result)}")
+                downloads[feed_id] = None
+            else:
+                downloads[feed_id] = result[1]
+        return downloads
+
+    async def _download_feed(
+        self,
+        client: httpx.AsyncClient,
+        global_limit: asyncio.Semaphore,
+        host_limits: Dict[str, asyncio.Semaphore],
+        feed_id: str,
+        url: str,
+        fetch_state: Optional[FeedFetchState] = None
+    ) -> tuple:
+        """Conditionally download a single feed, returning None on failure"""
+        headers = {}
+        if fetch_state is not None:
+            if fetch_state.etag:
+                headers['If-None-Match'] = fetch_state.etag
+            if fetch_state.last_modified:
+                headers['If-Modified-Since'] = fetch_state.last_modified
+
+        domain = urlparse(url).hostname or ''
+        if not resilience.breakers.allow(domain):
+            logger.warning(f"Circuit open for {domain}, skipping feed {feed_id}")
+            return feed_id, None
+
+        async with global_limit, host_limits[urlparse(url).netloc]:
+            try:
+                response = await client.get(url, headers=headers, timeout=settings.FETCH_TIMEOUT)
+                if response.status_code == 429 or response.status_code >= 500:
+                    resilience.breakers.record_failure(domain)
+                else:
+                    resilience.breakers.record_success(domain)
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return feed_id, {
+                    'status': response.status_code,
+                    'content': response.content if response.status_code != 304 else None,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }
+            except httpx.HTTPStatusError as e:
+                # The status was already recorded with the breaker above
+                logger.error(f"Error downloading feed {feed_id} from {url}: {str(e)}")
+                return feed_id, None
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                resilience.breakers.record_failure(domain)
+                logger.error(f"Error downloading feed {feed_id} from {url}: {str(e)}")
+                return feed_id, None
+
+    def _process_feed(self, db: Session, feed_id: str, config: Dict, content: Optional[bytes] = None) -> Optional[List[Dict]]:
+        """Parse a single RSS feed and return extraction jobs for its new entries, or None on failure"""
+        try:
+            feed_data = feedparser.parse(content if content is not None else config['url'])
+            return [
+                {'entry': entry, 'link': link, 'feed_id': feed_id, 'config': config, 'attempt': 1}
+                for link, entry in self._filter_new_entries(db, feed_data.entries)
+            ]
         except Exception as e:
             logger.error(f"Error processing feed {feed_id}: {str(e)}")
             db.rollback()
+            return None
+
+    def _dedupe_jobs(self, jobs: List[Dict]) -> List[Dict]:
+        """Keep one job per canonical link when several feeds carry the same story"""
+        unique = {}
+        for job in jobs:
+            unique.setdefault(job['link'], job)
+        if len(unique) < len(jobs):
+            logger.info(f"Skipped {len(jobs) - len(unique)} entries carried by more than one feed")
+        return list(unique.values())
+
+    def _run_extractions(self, jobs: List[Dict], writer: FeedWriter, incomplete_feeds: Set[str], stats: Dict) -> bool:
+        """Extract queued entries in the pool and store them, retrying transient failures without blocking"""
+        pending = {}
+        retries = RetryQueue()
+        # Rows are grouped into write batches whose topics are extracted in the pool before they are stored
+        rows = []
+        topic_jobs = {}
+        write_ok = True
+        self.domain_active.clear()
+        self.domain_waiting.clear()
+
+        for job in jobs:
+            self._submit_extraction(job, pending, incomplete_feeds, stats)
+
+        while pending or len(retries) or rows or topic_jobs:
+            if rows and (len(rows) >= writer.batch_size or not (pending or len(retries))):
+                self._submit_topics(rows, topic_jobs)
+                rows = []
+            for job in retries.pop_due():
+                self._submit_extraction(job, pending, incomplete_feeds, stats)
+            if not pending and not topic_jobs:
+                time.sleep(retries.seconds_until_next() or 0)
+                continue
+
+            done, _ = wait([*pending, *topic_jobs], timeout=retries.seconds_until_next(), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in topic_jobs:
+                    batch = self._collect_topics(future, topic_jobs)
+                    if batch is not None:
+                        write_ok = self._write_rows(batch, writer, stats) and write_ok
+                    continue
+
+                job = pending.pop(future)
+                entry = job['entry']
+                domain = urlparse(entry.link).hostname or ''
+                if not job.get('memoized'):
+                    self._release_domain(domain, pending, incomplete_feeds, stats)
+                try:
+                    content_data = future.result()
+                except Exception as e:
+                    logger.error(f"Error extracting entry {entry.link}: {str(e)}")
+                    content_data = None
+                    if not job.get('memoized'):
+                        resilience.breakers.record_failure(domain)
+                self._record_metrics(entry.link, content_data)
+                if content_data and content_data.get('extraction_success') and not job.get('memoized'):
+                    self.extraction_memo.put(
+                        (job['link'], content_data.get('canonical_url')),
+                        {key: value for key, value in content_data.items() if key != 'metrics'}
+                    )
+
+                if content_data and content_data.get('retryable'):
+                    resilience.breakers.record_failure(domain)
+                    if job['attempt'] < settings.RETRY_MAX_ATTEMPTS:
+                        delay = settings.RETRY_BASE_DELAY * 2 ** (job['attempt'] - 1)
+                        job['attempt'] += 1
+                        stats['extraction_retries'] += 1
+                        retries.push(job, delay)
+                        continue
+                elif content_data is not None and not job.get('memoized'):
+                    resilience.breakers.record_success(domain)
+
+                try:
+                    rows.append(self._build_feed_row(entry, entry.link.strip(), job['feed_id'], job['config'], content_data))
+                except Exception as e:
+                    logger.error(f"Error building entry {entry.get('link', 'unknown')}: {str(e)}")
+                    write_ok = False
+
+        # Jobs still waiting for a slot were never extracted; their feeds are reprocessed next cycle
+        for waiting in self.domain_waiting.values():
+            incomplete_feeds.update(job['feed_id'] for job in waiting)
+
+        try:
+            self.seen_links.update(writer.flush())
+        except Exception as e:
+            logger.error(f"Error storing feed entries: {str(e)}")
+            write_ok = False
+        return write_ok
+
+    def _submit_topics(self, rows: List[Dict], topic_jobs: Dict) -> None:
+        """Split a write batch into named entity jobs for the extraction pool"""
+        batch = {'rows': rows, 'remaining': 0}
+        for start in range(0, len(rows), settings.TOPIC_BATCH_SIZE):
+            chunk = rows[start:start + settings.TOPIC_BATCH_SIZE]
+            texts = [row['content'] or f"{row['title']} {row['description']}" for row in chunk]
+            topic_jobs[self.extraction_pool.submit_topics(texts)] = (batch, chunk)
+            batch['remaining'] += 1
+
+    def _collect_topics(self, future, topic_jobs: Dict) -> Optional[List[Dict]]:
+        """Store the topics of a finished job; returns the write batch once all of its jobs are done"""
+        batch, chunk = topic_jobs.pop(future)
+        try:
+            for row, topics in zip(chunk, future.result()):
+                row['topics'] = topics
+                row['topics_version'] = TOPICS_VERSION
+        except Exception as e:
+            # Rows keep an empty topics_version and are picked up by the topic backfill
+            logger.error(f"Error extracting topics: {str(e)}")
+        batch['remaining'] -= 1
+        return batch['rows'] if batch['remaining'] == 0 else None
+
+    def _write_rows(self, rows: List[Dict], writer: FeedWriter, stats: Dict) -> bool:
+        """Rank the keywords of a batch of rows together, cluster near-duplicates and hand the rows to the writer"""
+        if not rows:
+            return True
+        try:
+            texts = [row['content'] or f"{row['title']} {row['description']}" for row in rows]
+            keywords = self.keyword_engine.extract_many(texts, [row['language'] for row in rows])
+            for row, text, row_keywords in zip(rows, texts, keywords):
+                row['keywords'] = row_keywords
+                self._assign_cluster(row, text, stats)
+                self.seen_links.update(writer.add(row))
+            return True
+        except Exception as e:
+            logger.error(f"Error storing feed entries: {str(e)}")
+            return False
+
+    def _assign_cluster(self, row: Dict, text: str, stats: Dict) -> None:
+        """Fingerprint a row and place it in the near-duplicate cluster of an earlier copy of the same story"""
+        fingerprint = simhash(text)
+        if fingerprint is None:
+            return
+        cluster_id, is_duplicate = self.neardup_index.assign(fingerprint)
+        row['simhash'] = to_signed(fingerprint)
+        row['cluster_id'] = to_signed(cluster_id)
+        row['is_duplicate'] = is_duplicate
+        if is_duplicate:
+            stats['near_duplicates'] += 1
+
+    def _submit_extraction(self, job: Dict, pending: Dict, incomplete_feeds: Set[str], stats: Dict) -> None:
+        """Send a job to the extraction pool unless its domain's circuit breaker is open or its download cap is reached"""
+        link = job['entry'].link
+        memoized = self.extraction_memo.get(job['link'])
+        if memoized is not None:
+            # Another feed's copy of this story was already extracted
+            future = Future()
+            future.set_result(memoized)
+            job['memoized'] = True
+            pending[future] = job
+            stats['extractions_memoized'] += 1
+            return
+        domain = urlparse(link).hostname or ''
+        # Checked before the breaker so a waiting job never takes a half-open breaker's single trial
+        if self.domain_active[domain] >= settings.HTTP_MAX_CONNECTIONS_PER_HOST:
+            self.domain_waiting[domain].append(job)
+            return
+        if not resilience.breakers.allow(domain):
+            # Leave the entry unstored; the feed is reprocessed next cycle
+            logger.debug(f"Circuit open, deferring extraction of {link}")
+            incomplete_feeds.add(job['feed_id'])
+            stats['extractions_deferred'] += 1
+            return
+        strategies = self.strategy_stats.order(domain)
+        pending[self.extraction_pool.submit(link, job['config'].get('language'), strategies)] = job
+        self.domain_active[domain] += 1
+
+    def _release_domain(self, domain: str, pending: Dict, incomplete_feeds: Set[str], stats: Dict) -> None:
+        """Free a finished download's slot and submit waiting jobs of that domain until one takes it"""
+        self.domain_active[domain] -= 1
+        waiting = self.domain_waiting.get(domain)
+        # Memoized and breaker-deferred jobs leave the slot free, so the next waiting job gets it
+        while waiting and self.domain_active[domain] < settings.HTTP_MAX_CONNECTIONS_PER_HOST:
+            self._submit_extraction(waiting.popleft(), pending, incomplete_feeds, stats)
+
+    def _record_metrics(self, url: str, content_data: Optional[Dict]) -> None:
+        """Fold the connection counts, language tier and strategy attempts reported by a worker into the shared stats"""
+        metrics = (content_data or {}).get('metrics') or {}
+        domain = urlparse(url).hostname or ''
+        for attempt in metrics.get('strategy_attempts', []):
+            self.strategy_stats.record(domain, attempt['strategy'], attempt['success'], attempt['seconds'])
+        if metrics.get('language_tier'):
+            language.stats.record(metrics['language_tier'])
+        if metrics.get('http_requests'):
+            http_client.stats.record_request(
+                domain,
+                requests=metrics['http_requests'],
+                new_connections=metrics.get('http_new_connections', 0)
+            )
+
+    def _build_feed_row(self, entry, link: str, feed_id: str, config: Dict, content_data: Optional[Dict]) -> Dict:
+        """Build the column values of a feed entry, stored under the link the feed published, and its extracted content"""
+        row = {
+            'title': entry.get('title', ''),
+            'description': entry.get('description', ''),
+            'link': link,
+            # published_date is the partition key, so undated entries are filed under the time they were fetched
+            'published_date': self.parse_date(entry.get('published', '')) or datetime.utcnow(),
+            'source': feed_id,
+            'language': config.get('language'),
+            'region': config.get('region'),
+            # National feeds get the state their article URLs name, if any
+            'state': self.domains.state(link, config.get('state')),
+            'content': None,
+            'content_html': None,
+            'author': None,
+            'image_urls': None,
+            'keywords': None,
+            'topics': None,
+            'topics_version': None,
+            'simhash': None,
+            'cluster_id': None,
+            'is_duplicate': False,
+            'summary': None,
+            'extracted_by': None,
+            'extraction_time': None,
+            'extraction_success': False
+        }
+
+        # Add content extraction data if available
+        row.update(extracted_columns(content_data))
+        return row
+
+    def _filter_new_entries(self, db: Session, entries: List) -> List[Tuple[str, Dict]]:
+        """Return (canonical link, entry) pairs whose links are not stored yet, using one query for cache misses"""
+        candidates = {}
+        raw_links = set()
+        for entry in entries:
+            link = canonicalize_url(entry.get('link'))
+            if link and link not in self.seen_links and link not in candidates:
+                candidates[link] = entry
+                raw_links.add(entry.get('link').strip())
+
+        if candidates:
+            # Rows store the link as published, which may differ from its canonical form
+            lookup = list(raw_links | set(candidates))
+            known = {canonicalize_url(link) for (link,) in db.query(Feed.link).filter(Feed.link.in_(lookup)).all()}
+            self.seen_links.update(known)
+            for link in known:
+                candidates.pop(link, None)
 
-    def _entry_exists(self, db: Session, link: str) -> bool:
-        """Check if an entry already exists in the database"""
-        return db.query(exists().where(Feed.link == link)).scalar() 
\ No newline at end of file
+        return list(candidates.items())
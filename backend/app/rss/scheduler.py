@@ -1,18 +1,52 @@
-import schedule
+import heapq
 import time
 import json
 import logging
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
+from ..config import settings
 from .fetcher import RSSFetcher
 
 logger = logging.getLogger(__name__)
 
+class FeedPollState:
+    """Observed publication rate and next due time of a single feed"""
+
+    def __init__(self, feed_id: str, interval_minutes: float):
+        self.feed_id = feed_id
+        self.interval_minutes = interval_minutes
+        self.items_per_minute: Optional[float] = None
+        self.last_polled_at: Optional[float] = None
+        self.next_due = 0.0
+
+    def record_poll(self, new_items: int, polled_at: float) -> None:
+        """Update the publication rate from a poll and derive the next due time"""
+        if self.last_polled_at is not None:
+            elapsed_minutes = max((polled_at - self.last_polled_at) / 60, 1.0)
+            observed = new_items / elapsed_minutes
+            if self.items_per_minute is None:
+                self.items_per_minute = observed
+            else:
+                alpha = settings.POLL_RATE_SMOOTHING
+                self.items_per_minute = alpha * observed + (1 - alpha) * self.items_per_minute
+
+            if self.items_per_minute > 0:
+                # Poll again once roughly POLL_TARGET_NEW_ITEMS new items are expected
+                interval = settings.POLL_TARGET_NEW_ITEMS / self.items_per_minute
+            else:
+                interval = self.interval_minutes * 2
+            self.interval_minutes = min(max(interval, settings.POLL_MIN_INTERVAL), settings.POLL_MAX_INTERVAL)
+
+        # The first poll only sees the feed's backlog, so it keeps the initial interval
+        self.last_polled_at = polled_at
+        self.next_due = polled_at + self.interval_minutes * 60
+
 class RSSScheduler:
     def __init__(self, config_path: str = "feeds_config.json"):
         self.config_path = config_path
         self.fetcher = RSSFetcher()
         self.feeds_config = self._load_config()
+        self.poll_states: Dict[str, FeedPollState] = {}
 
     def _load_config(self) -> Dict:
         """Load RSS feed configuration from JSON file"""
@@ -28,26 +62,54 @@ class RSSScheduler:
             logger.error(f"Error loading config from {self.config_path}: {str(e)}")
             return {}
 
-    def fetch_feeds(self) -> None:
-        """Fetch all configured RSS feeds"""
+    def fetch_feeds(self, feed_ids: Optional[List[str]] = None) -> Optional[Dict]:
+        """Fetch the given configured RSS feeds, or all of them"""
+        feeds_config = self.feeds_config
+        if feed_ids is not None:
+            feeds_config = {feed_id: self.feeds_config[feed_id] for feed_id in feed_ids}
+
         try:
-            logger.info("Starting RSS feed fetch")
-            self.fetcher.fetch_and_store_feeds(self.feeds_config)
-            logger.info("Completed RSS feed fetch")
+            logger.info(f"Starting RSS feed fetch for {len(feeds_config)} feeds")
+            stats = self.fetcher.fetch_and_store_feeds(feeds_config)
+            logger.info(
+                f"Completed RSS feed fetch: skipped {stats['feeds_not_modified'] + stats['feeds_unchanged']} "
+                f"of {stats['feeds_total']} unchanged feeds"
+            )
+            return stats
         except Exception as e:
             logger.error(f"Error in fetch_feeds: {str(e)}")
+            return None
 
     def start(self, interval_minutes: int = 30) -> None:
-        """Start the RSS feed scheduler"""
-        logger.info(f"Starting RSS scheduler with {interval_minutes} minute interval")
-        
-        # Schedule the job
-        schedule.every(interval_minutes).minutes.do(self.fetch_feeds)
-        
-        # Run immediately on start
-        self.fetch_feeds()
-        
-        # Keep running
-        while True:
-            schedule.run_pending()
-            time.sleep(1) 
\ No newline at end of file
+        """Start the RSS feed scheduler, polling each feed at an interval adapted to its publication rate"""
+        logger.info(
+            f"Starting adaptive RSS scheduler with {interval_minutes} minute initial interval "
+            f"({settings.POLL_MIN_INTERVAL}-{settings.POLL_MAX_INTERVAL} minute bounds)"
+        )
+
+        # Priority queue of (next due time, feed id); every feed is due immediately on start
+        queue = []
+        for feed_id in self.feeds_config:
+            self.poll_states[feed_id] = FeedPollState(feed_id, interval_minutes)
+            heapq.heappush(queue, (0.0, feed_id))
+
+        while queue:
+            now = time.time()
+            if queue[0][0] > now:
+                time.sleep(queue[0][0] - now)
+                continue
+
+            # Poll every feed due within the batch window together so downloads still overlap
+            due = []
+            while queue and queue[0][0] <= now + settings.POLL_BATCH_WINDOW:
+                due.append(heapq.heappop(queue)[1])
+
+            stats = self.fetch_feeds(due)
+            polled_at = time.time()
+            for feed_id in due:
+                poll_state = self.poll_states[feed_id]
+                poll_state.record_poll(stats['new_entries'].get(feed_id, 0) if stats else 0, polled_at)
+                heapq.heappush(queue, (poll_state.next_due, feed_id))
+                logger.debug(f"Next poll of {feed_id} in {poll_state.interval_minutes:.1f} minutes")
+
+        logger.warning("No feeds configured, RSS scheduler stopped")
@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..feed_stats import apply_counts, count_rows
+from ..models import Feed
+
+logger = logging.getLogger(__name__)
+
+# Columns refreshed when an existing link is written again in "update" mode
+UPDATABLE_COLUMNS = (
+    'title', 'description', 'content', 'content_html', 'author',
+    'image_urls', 'keywords', 'topics', 'topics_version', 'simhash', 'cluster_id', 'is_duplicate', 'summary',
+    'extracted_by', 'extraction_time', 'extraction_success'
+)
+
+def extracted_columns(content_data: Optional[Dict]) -> Dict:
+    """Map a successful extraction result onto Feed columns; empty when extraction failed"""
+    if not content_data or not content_data.get('extraction_success'):
+        return {}
+    return {
+        'content': content_data.get('text', ''),
+        'content_html': content_data.get('html', ''),
+        'author': content_data.get('author', ''),
+        'image_urls': content_data.get('image_urls', []),
+        'keywords': content_data.get('keywords', []),
+        'summary': content_data.get('summary', ''),
+        'extracted_by': content_data.get('extracted_by', ''),
+        'extraction_time': (
+            datetime.fromisoformat(content_data['extraction_time'].replace('Z', '+00:00'))
+            if content_data.get('extraction_time')
+            else datetime.utcnow()
+        ),
+        'extraction_success': True
+    }
+
+class FeedWriter:
+    """Buffers new feed rows and writes them with multi-row INSERT ... ON CONFLICT (link, published_date)"""
+
+    def __init__(self, db: Session, batch_size: Optional[int] = None, on_conflict: Optional[str] = None):
+        self.db = db
+        self.batch_size = batch_size or settings.WRITE_BATCH_SIZE
+        self.on_conflict = on_conflict or settings.WRITE_ON_CONFLICT
+        if self.on_conflict not in ('nothing', 'update'):
+            raise ValueError(f"Unsupported on_conflict mode: {self.on_conflict}")
+        # Keyed by link so one batch never carries the same row twice
+        self._rows: Dict[str, Dict] = {}
+        self.stats = {'inserted': 0, 'updated': 0, 'skipped': 0}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, row: Dict) -> List[str]:
+        """Buffer a row, flushing when the batch is full; returns links written by that flush"""
+        self._rows[row['link']] = row
+        if len(self._rows) >= self.batch_size:
+            return self.flush()
+        return []
+
+    def flush(self) -> List[str]:
+        """Write all buffered rows in one statement and return the links that were written"""
+        if not self._rows:
+            return []
+
+        rows = list(self._rows.values())
+        self._rows = {}
+
+        stmt = insert(Feed).values(rows)
+        if self.on_conflict == 'update':
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Feed.link, Feed.published_date],
+                set_={column: stmt.excluded[column] for column in UPDATABLE_COLUMNS}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Feed.link, Feed.published_date])
+        # xmax is 0 only for freshly inserted tuples, which separates inserts from updates
+        stmt = stmt.returning(
+            Feed.link, Feed.language, Feed.region, Feed.state, literal_column('xmax = 0').label('inserted')
+        )
+
+        try:
+            result = self.db.execute(stmt).all()
+            # Counters change in the same transaction as the rows so /stats never drifts from the table
+            apply_counts(self.db, count_rows(row for row in result if row.inserted))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        inserted = sum(1 for row in result if row.inserted)
+        self.stats['inserted'] += inserted
+        self.stats['updated'] += len(result) - inserted
+        self.stats['skipped'] += len(rows) - len(result)
+        logger.info(
+            f"Wrote batch of {len(rows)} feed entries: {inserted} inserted, "
+            f"{len(result) - inserted} updated, {len(rows) - len(result)} skipped"
+        )
+        return [row.link for row in result]
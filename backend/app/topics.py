@@ -0,0 +1,108 @@
+"""
+Recompute the stored topics of articles extracted by an older topic extractor
+
+Usage:
+    python -m app.topics [--workers 8] [--batch-size 200]
+"""
+import argparse
+import logging
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from .config import settings
+from .database import SessionLocal
+from .extraction_pool import ExtractionPool
+from .models import Feed
+from .nlp import TOPICS_VERSION
+
+logger = logging.getLogger(__name__)
+
+def recompute_stale_topics(workers: Optional[int] = None, batch_size: int = 200) -> Dict[str, int]:
+    """Extract topics for every article whose topics_version is missing or outdated"""
+    stats = {'articles': 0, 'updated': 0, 'failed': 0}
+    db = SessionLocal()
+    pool = ExtractionPool(workers)
+    try:
+        pending = {}
+        updates = []
+        max_in_flight = pool.max_workers * 2
+        chunks = _iter_stale_chunks(db, settings.TOPIC_BATCH_SIZE)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                texts = [row.content or f"{row.title or ''} {row.description or ''}" for row in chunk]
+                # The primary key includes the partition key
+                pending[pool.submit_topics(texts)] = [(row.id, row.published_date) for row in chunk]
+                stats['articles'] += len(chunk)
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ids = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    logger.error(f"Topic extraction failed for {len(ids)} articles: {str(e)}")
+                    stats['failed'] += len(ids)
+                    continue
+                updates.extend(
+                    {'id': feed_id, 'published_date': published_date, 'topics': topics, 'topics_version': TOPICS_VERSION}
+                    for (feed_id, published_date), topics in zip(ids, results)
+                )
+
+            if len(updates) >= batch_size:
+                stats['updated'] += _apply_updates(db, updates)
+                updates = []
+
+        stats['updated'] += _apply_updates(db, updates)
+    finally:
+        pool.shutdown()
+        db.close()
+
+    logger.info(f"Recomputed topics of {stats['updated']} of {stats['articles']} articles, {stats['failed']} failed")
+    return stats
+
+def _iter_stale_chunks(db: Session, chunk_size: int) -> Iterator:
+    """Yield lists of articles with stale topics in id order, paging by id so commits can happen in between"""
+    last_id = 0
+    while True:
+        chunk = (
+            db.query(Feed.id, Feed.published_date, Feed.title, Feed.description, Feed.content)
+            .filter(
+                or_(Feed.topics_version.is_(None), Feed.topics_version != TOPICS_VERSION),
+                Feed.id > last_id
+            )
+            .order_by(Feed.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1].id
+
+def _apply_updates(db: Session, updates: List[Dict]) -> int:
+    """Write a batch of topics in one transaction"""
+    if not updates:
+        return 0
+    db.bulk_update_mappings(Feed, updates)
+    db.commit()
+    return len(updates)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute stale article topics")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: EXTRACTION_WORKERS)")
+    parser.add_argument('--batch-size', type=int, default=200, help="Rows updated per transaction")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(recompute_stale_topics(args.workers, args.batch_size))
+
+if __name__ == '__main__':
+    main()
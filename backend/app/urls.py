@@ -0,0 +1,64 @@
+import re
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+from lxml.html import HtmlElement
+
+# Query parameters that only track where a click came from
+TRACKING_PARAM_PREFIXES = ('utm_',)
+TRACKING_PARAMS = {
+    'ref', 'ref_src', 'ref_url', 'referrer', 'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid',
+    'cmpid', 'ncid', 'ito', 'yclid', 'igshid', 'amp', 'outputtype'
+}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# AMP variants of an article path: /amp/..., .../amp, .../amp/1, /foo.amp, /foo.amp.html and TOI-style amp_articleshow
+AMP_SEGMENT = re.compile(r'^/amp(?=/)|/amp(?:/\d+)?/?$')
+AMP_SUFFIX = re.compile(r'\.amp(?=\.html?$|$)')
+AMP_PREFIX = re.compile(r'(?<=/)amp_(?=\w)')
+
+def canonicalize_url(url: str) -> str:
+    """Normalise an article URL so tracking and AMP variants of the same story compare equal"""
+    if not url:
+        return url
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+
+    host = (parts.hostname or '').lower().rstrip('.')
+    if host.startswith('amp.'):
+        host = host[4:]
+    if parts.port and parts.port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or '/'
+    path = AMP_SEGMENT.sub('', path) or '/'
+    path = AMP_SUFFIX.sub('', path)
+    path = AMP_PREFIX.sub('', path)
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAM_PREFIXES) and key.lower() not in TRACKING_PARAMS
+    )
+
+    # Schemes are unified on https so http and https copies share one key
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+def _site(host: str) -> str:
+    """Last two labels of a host, enough to tell whether a declared canonical stays on the same site"""
+    return '.'.join(host.split('.')[-2:])
+
+def find_canonical_url(tree: HtmlElement, url: str) -> Optional[str]:
+    """Return the canonicalised rel=canonical (or og:url) of a page when it points at the same site"""
+    candidates = tree.xpath('//link[@rel="canonical"]/@href') + tree.xpath('//meta[@property="og:url"]/@content')
+    for href in candidates:
+        href = href.strip()
+        if not href:
+            continue
+        canonical = canonicalize_url(urljoin(url, href))
+        if _site(urlsplit(canonical).hostname or '') == _site(urlsplit(url).hostname or ''):
+            return canonical
+    return None
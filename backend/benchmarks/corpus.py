@@ -0,0 +1,59 @@
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+CORPUS_DIR = Path(__file__).parent / 'corpus'
+MANIFEST_NAME = 'manifest.json'
+
+class Corpus:
+    """Frozen set of raw article pages: a manifest plus one gzip file per page body"""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else CORPUS_DIR
+        self.pages_dir = self.root / 'pages'
+        self.manifest_path = self.root / MANIFEST_NAME
+        self.entries: List[Dict] = []
+        if self.manifest_path.exists():
+            with open(self.manifest_path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def urls(self) -> set:
+        return {entry['url'] for entry in self.entries}
+
+    def add(self, url: str, feed_id: str, language: Optional[str], raw: bytes, encoding: Optional[str]) -> None:
+        """Store a page body under its digest; identical bodies are written once"""
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self.pages_dir / f"{digest[:16]}.html.gz"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # mtime=0 keeps the file identical when the corpus is recorded again
+            with open(path, 'wb') as f, gzip.GzipFile(fileobj=f, mode='wb', mtime=0) as gz:
+                gz.write(raw)
+        self.entries.append({
+            'url': url,
+            'feed_id': feed_id,
+            'language': language,
+            'encoding': encoding,
+            'file': path.name,
+            'sha256': digest
+        })
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(sorted(self.entries, key=lambda entry: (entry['feed_id'], entry['url'])), f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+    def pages(self) -> Iterator[Tuple[Dict, bytes]]:
+        """Yield each manifest entry with its raw page body, checking it has not changed since it was recorded"""
+        for entry in self.entries:
+            with gzip.open(self.pages_dir / entry['file'], 'rb') as f:
+                raw = f.read()
+            if hashlib.sha256(raw).hexdigest() != entry['sha256']:
+                raise ValueError(f"Corpus page {entry['file']} does not match its recorded digest")
+            yield entry, raw
@@ -0,0 +1,72 @@
+"""
+Record the article pages of every configured feed into the benchmark corpus
+
+Usage:
+    python -m benchmarks.record_corpus [--per-feed 5] [--corpus benchmarks/corpus]
+
+Pages already in the corpus are kept, so the corpus only grows until it is deleted and recorded again.
+"""
+import argparse
+import logging
+from pathlib import Path
+from typing import Dict
+import feedparser
+import httpx
+from app import http_client
+from app.config import load_feed_config
+from app.urls import canonicalize_url
+from .corpus import Corpus
+
+logger = logging.getLogger(__name__)
+
+def record(corpus: Corpus, feeds_config: Dict, per_feed: int) -> Dict[str, int]:
+    """Download up to per_feed article pages from the current entries of each feed"""
+    stats = {'feeds': 0, 'pages': 0, 'failed': 0}
+    known = corpus.urls()
+    for feed_id, config in feeds_config.items():
+        try:
+            response = http_client.get(config['url'])
+            response.raise_for_status()
+            feed = feedparser.parse(response.content)
+        except httpx.HTTPError as e:
+            logger.warning(f"Skipping feed {feed_id}: {str(e)}")
+            continue
+        stats['feeds'] += 1
+
+        recorded = 0
+        for entry in feed.entries:
+            if recorded >= per_feed:
+                break
+            url = canonicalize_url(entry.get('link', ''))
+            if not url or url in known:
+                continue
+            try:
+                raw, content_type = http_client.download(url)
+            except httpx.HTTPError as e:
+                logger.warning(f"Failed to record {url}: {str(e)}")
+                stats['failed'] += 1
+                continue
+            charset = content_type.partition('charset=')[2].split(';')[0].strip() or None
+            corpus.add(url, feed_id, config.get('language'), raw, charset)
+            known.add(url)
+            recorded += 1
+        stats['pages'] += recorded
+        logger.info(f"Recorded {recorded} pages from {feed_id}")
+    return stats
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record article pages for the extraction benchmark")
+    parser.add_argument('--per-feed', type=int, default=5, help="Pages recorded from each feed")
+    parser.add_argument('--corpus', type=Path, default=None, help="Corpus directory (default: benchmarks/corpus)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    corpus = Corpus(args.corpus)
+    try:
+        print(record(corpus, load_feed_config(), args.per_feed))
+    finally:
+        corpus.save()
+        http_client.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark the content extraction stages over the recorded corpus with network access disabled
+
+Usage:
+    python -m benchmarks.run [--repeat 3] [--output results.json] [--baseline baseline.json] [--threshold 0.15]
+
+Exits with status 1 when a baseline is given and throughput or a stage's latency regressed past the threshold.
+"""
+import argparse
+import json
+import logging
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from app.content_extractor import ContentExtractor
+from app.keywords import KeywordEngine
+from .corpus import Corpus
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('parse', 'date', 'trafilatura', 'newspaper', 'language', 'keywords', 'document')
+PERCENTILES = (50, 95, 99)
+
+def _disable_network() -> None:
+    """Make every outgoing connection fail so a stage that tries to fetch is caught instead of timed"""
+    def refuse(*args, **kwargs):
+        raise RuntimeError("Network access is disabled during benchmarks")
+    socket.socket.connect = refuse
+    socket.socket.connect_ex = refuse
+    socket.create_connection = refuse
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 ** 2 if sys.platform == 'darwin' else 1024), 1)
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+class Timings:
+    """Latency samples of each stage"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def time(self, stage: str, fn: Callable, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.samples[stage].append(time.perf_counter() - start)
+        return result
+
+    def summary(self) -> Dict[str, Dict]:
+        stages = {}
+        for stage in STAGES:
+            samples = np.array(self.samples.get(stage, []))
+            if not len(samples):
+                continue
+            stages[stage] = {
+                'count': int(len(samples)),
+                'mean_ms': round(float(samples.mean()) * 1000, 3),
+                **{
+                    f"p{percentile}_ms": round(float(np.percentile(samples, percentile)) * 1000, 3)
+                    for percentile in PERCENTILES
+                }
+            }
+        return stages
+
+def run(corpus: Corpus, repeat: int) -> Dict:
+    """Time every stage on every corpus page, repeat times after one untimed warm-up pass"""
+    extractor = ContentExtractor()
+    pages = list(corpus.pages())
+    if not pages:
+        raise SystemExit(f"The corpus at {corpus.root} is empty; record it with python -m benchmarks.record_corpus")
+
+    # Keyword statistics come from the corpus itself so results do not depend on local state
+    keyword_engine = KeywordEngine(stats_file='')
+    timings = Timings()
+    document_seconds = 0.0
+    for iteration in range(repeat + 1):
+        if iteration == 1:
+            timings = Timings()
+        for entry, raw in pages:
+            url, language = entry['url'], entry['language']
+            tree = timings.time('parse', extractor._parse_html, raw, entry['encoding'])
+            if tree is None:
+                continue
+            timings.time('date', extractor._parse_date, '', tree)
+            content = timings.time('trafilatura', extractor._extract_with_trafilatura, url, tree, language)
+            html = extractor._decode_html(raw, tree)
+            fallback = timings.time('newspaper', extractor._extract_with_newspaper, url, html, tree, language)
+            text = (content or fallback or {}).get('text') or ''
+            timings.time('language', extractor._detect_language, text, tree.get('lang'), language)
+            timings.time('keywords', keyword_engine.extract_many, [text], [language], update_stats=iteration == 0)
+
+            start = time.perf_counter()
+            extractor._extract_document(url, raw, entry['encoding'], {}, language)
+            elapsed = time.perf_counter() - start
+            timings.samples['document'].append(elapsed)
+            if iteration:
+                document_seconds += elapsed
+
+    articles = len(pages) * repeat
+    return {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'articles': len(pages),
+        'repeat': repeat,
+        'articles_per_sec': round(articles / document_seconds, 2) if document_seconds else 0.0,
+        'peak_rss_mb': _peak_rss_mb(),
+        'stages': timings.summary()
+    }
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Describe every metric that got worse than the baseline by more than threshold (a fraction)"""
+    regressions = []
+    if baseline.get('articles_per_sec') and results['articles_per_sec'] < baseline['articles_per_sec'] * (1 - threshold):
+        regressions.append(f"articles/sec {baseline['articles_per_sec']} -> {results['articles_per_sec']}")
+    if baseline.get('peak_rss_mb') and results['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + threshold):
+        regressions.append(f"peak RSS {baseline['peak_rss_mb']} MB -> {results['peak_rss_mb']} MB")
+    for stage, summary in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous:
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            if previous.get(key) and summary[key] > previous[key] * (1 + threshold):
+                regressions.append(f"{stage} {key} {previous[key]} -> {summary[key]}")
+    return regressions
+
+def _print_report(results: Dict) -> None:
+    print(f"commit {results['commit']}: {results['articles']} articles x {results['repeat']}")
+    print(f"throughput {results['articles_per_sec']} articles/sec, peak RSS {results['peak_rss_mb']} MB")
+    print(f"{'stage':<12}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+    for stage, summary in results['stages'].items():
+        print(
+            f"{stage:<12}{summary['mean_ms']:>10.2f}{summary['p50_ms']:>10.2f}"
+            f"{summary['p95_ms']:>10.2f}{summary['p99_ms']:>10.2f}"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark content extraction over the recorded corpus")
+    parser.add_argument('--corpus', type=Path, default=None, help="Corpus directory (default: benchmarks/corpus)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes over the corpus")
+    parser.add_argument('--output', type=Path, default=None, help="Write the results as JSON to this file")
+    parser.add_argument('--baseline', type=Path, default=None, help="Results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15, help="Relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    # Extraction failures are expected on some pages and would drown the report
+    logging.basicConfig(level=logging.ERROR)
+    _disable_network()
+    results = run(Corpus(args.corpus), args.repeat)
+    _print_report(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+if __name__ == '__main__':
+    main()
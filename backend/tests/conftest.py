@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Settings require a database URL at import time; tests never connect to it
+os.environ.setdefault('DATABASE_URL', 'postgresql://test@localhost/test')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from types import SimpleNamespace
+import pytest
+from app import resilience
+from app.config import settings
+from app.rss.dedup import ExtractionMemo
+from app.rss.fetcher import RSSFetcher
+
+
+class FakePool:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, link, language, strategies):
+        self.submitted.append(link)
+        return Future()
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    monkeypatch.setattr(settings, 'HTTP_MAX_CONNECTIONS_PER_HOST', 1)
+    fetcher = RSSFetcher.__new__(RSSFetcher)
+    fetcher.extraction_pool = FakePool()
+    fetcher.extraction_memo = ExtractionMemo(10)
+    fetcher.strategy_stats = SimpleNamespace(order=lambda domain: [])
+    fetcher.domain_active = defaultdict(int)
+    fetcher.domain_waiting = defaultdict(deque)
+    return fetcher
+
+
+def _job(number, feed_id='feed'):
+    link = f'https://example.com/story-{number}'
+    return {'entry': SimpleNamespace(link=link), 'link': link, 'feed_id': feed_id, 'config': {}, 'attempt': 1}
+
+
+def _stats():
+    return {'extractions_memoized': 0, 'extractions_deferred': 0}
+
+
+def test_release_skips_memoized_and_deferred_jobs(fetcher, monkeypatch):
+    # The first job takes the slot, the third is deferred by the breaker and the fourth gets the slot
+    allowed = iter([True, False, True])
+    monkeypatch.setattr(resilience.breakers, 'allow', lambda domain: next(allowed))
+    jobs = [_job(number, feed_id=f'feed-{number}') for number in range(4)]
+    pending, incomplete, stats = {}, set(), _stats()
+
+    for job in jobs:
+        fetcher._submit_extraction(job, pending, incomplete, stats)
+    assert fetcher.extraction_pool.submitted == [jobs[0]['link']]
+    assert len(fetcher.domain_waiting['example.com']) == 3
+
+    # Another feed's copy of the second story is extracted while it waits
+    fetcher.extraction_memo.put([jobs[1]['link']], {'extraction_success': True})
+
+    fetcher._release_domain('example.com', pending, incomplete, stats)
+    assert fetcher.extraction_pool.submitted == [jobs[0]['link'], jobs[3]['link']]
+    assert stats == {'extractions_memoized': 1, 'extractions_deferred': 1}
+    assert incomplete == {'feed-2'}
+    assert fetcher.domain_active['example.com'] == 1
+    assert not fetcher.domain_waiting['example.com']
+
+
+def test_release_with_open_breaker_defers_every_waiting_job(fetcher, monkeypatch):
+    allowed = iter([True])
+    monkeypatch.setattr(resilience.breakers, 'allow', lambda domain: next(allowed, False))
+    pending, incomplete, stats = {}, set(), _stats()
+
+    for number in range(5):
+        fetcher._submit_extraction(_job(number), pending, incomplete, stats)
+    fetcher._release_domain('example.com', pending, incomplete, stats)
+
+    assert stats['extractions_deferred'] == 4
+    assert incomplete == {'feed'}
+    assert fetcher.domain_active['example.com'] == 0
+    assert not fetcher.domain_waiting['example.com']
@@ -0,0 +1,19 @@
+from app.keywords import KeywordEngine, LanguageStats
+
+HINDI_TEXT = (
+    "दिल्ली में आज भारी बारिश हुई है। मौसम विभाग ने चेतावनी जारी की है। "
+    "बारिश के कारण यातायात प्रभावित हुआ है॥ दिल्ली सरकार ने स्कूल बंद किए हैं।"
+)
+
+
+def test_hindi_tokens_exclude_danda():
+    tokens = LanguageStats('hi', max_terms=1000).tokenize(HINDI_TEXT)
+    assert tokens
+    assert not [token for token in tokens if '।' in token or '॥' in token]
+    assert 'है' not in tokens and 'बारिश' in tokens
+
+
+def test_hindi_keywords_exclude_danda():
+    keywords = KeywordEngine(stats_file='').extract_many([HINDI_TEXT], ['hi'])[0]
+    assert keywords
+    assert not [keyword for keyword in keywords if '।' in keyword or '॥' in keyword]
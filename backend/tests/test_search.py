@@ -0,0 +1,23 @@
+from sqlalchemy.dialects import postgresql
+from app import crud
+
+
+def _params(clause) -> list:
+    return list(clause.compile(dialect=postgresql.dialect()).params.values())
+
+
+def test_negated_term_is_matched_with_the_rows_own_configuration():
+    match, row_query = crud._search_match('election -sports')
+
+    # One branch per configuration, OR-ed as whole conditions rather than as tsqueries,
+    # so "-sports" parsed by one configuration cannot let a row through the other
+    english, default = match.clauses
+    assert sorted(_params(english), key=str) == ['election -sports', 'en', 'english']
+    assert 'simple' in _params(default) and 'english' not in _params(default)
+    assert 'election -sports' in _params(default)
+    sql = str(match.compile(dialect=postgresql.dialect()))
+    assert '||' not in sql
+    assert sql.count('feeds.search_vector @@ websearch_to_tsquery') == 2
+
+    # Rows are ranked with the query of their own language
+    assert _params(row_query) == ['en', 'english', 'election -sports', 'simple', 'election -sports']